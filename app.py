@@ -4,16 +4,25 @@
 """
 
 import streamlit as st
-from PIL import Image, ImageDraw, ImageFont
 from deep_translator import GoogleTranslator
 import time
 from datetime import datetime
-from pathlib import Path
 import docx
 import PyPDF2
 import io
 import zipfile
 import re
+import html
+import poster
+from poster import encode_png
+import logo_store
+import translation
+import singleflight
+import archive
+import render_pool
+import source_store
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from patterns import DATE_PATTERNS, TIME_PATTERNS, CONTACT_PATTERNS
 
 # ============================================
 # 페이지 설정
@@ -40,7 +49,25 @@ LANGUAGES = {
     'si': 'සිංහල 🇱🇰'
 }
 
-BRAND_COLOR = '#2B9FD9'
+# 번역 배치 전체 마감 시간 (초)
+TRANSLATION_DEADLINE = 20
+
+# 이미지 렌더 워커 수
+RENDER_WORKERS = 4
+
+# 원문 보기 한 페이지의 줄 수
+SOURCE_PAGE_LINES = 40
+
+# 원문 보기에서 강조할 추출 항목
+SOURCE_FIELDS = {
+    'title': '📢 제목',
+    'date': '📅 일시',
+    'time': '🕐 시간',
+    'location': '📍 장소',
+    'target': '👥 대상',
+    'how_to_apply': '✍️ 신청',
+    'contact': '📞 문의'
+}
 
 # ============================================
 # CSS 스타일
@@ -89,6 +116,10 @@ st.markdown("""
         border-radius: 5px;
         margin: 1rem 0;
     }
+    .original-box mark {
+        background-color: #fff3cd;
+        border-radius: 3px;
+    }
 </style>
 """, unsafe_allow_html=True)
 
@@ -106,83 +137,74 @@ def extract_key_info(text):
         'target': '',
         'contact': '',
         'how_to_apply': '',
-        'content': ''
+        'content': '',
+        'lines': {}
     }
     
-    lines = text.strip().split('\n')
-    lines = [line.strip() for line in lines if line.strip()]
+    # 원문 줄 번호를 함께 기억해 원문 보기에서 다시 찾지 않고 강조
+    numbered = [(line_no, line.strip()) for line_no, line in enumerate(text.split('\n')) if line.strip()]
+    lines = [line for _, line in numbered]
     
     # 제목 찾기
-    for i, line in enumerate(lines[:5]):
+    for i, (line_no, line) in enumerate(numbered[:5]):
         if len(line) > 5 and (
             '안내' in line or '공고' in line or '모집' in line or 
             '프로그램' in line or '교육' in line or i == 0
         ):
             info['title'] = line
+            info['lines']['title'] = line_no
             break
     
     # 날짜 찾기
-    date_patterns = [
-        r'(\d{4})[년.-]\s*(\d{1,2})[월.-]\s*(\d{1,2})일?',
-        r'(\d{1,2})[월/]\s*(\d{1,2})일?',
-        r'(\d{4})[./]\s*(\d{1,2})[./]\s*(\d{1,2})'
-    ]
-    
-    for line in lines:
-        for pattern in date_patterns:
+    for line_no, line in numbered:
+        for pattern in DATE_PATTERNS:
             match = re.search(pattern, line)
             if match:
                 info['date'] = match.group(0)
+                info['lines']['date'] = line_no
                 break
         if info['date']:
             break
     
     # 시간 찾기
-    time_patterns = [
-        r'(\d{1,2}):(\d{2})',
-        r'(\d{1,2})시\s*(\d{1,2})?분?'
-    ]
-    
-    for line in lines:
-        for pattern in time_patterns:
+    for line_no, line in numbered:
+        for pattern in TIME_PATTERNS:
             match = re.search(pattern, line)
             if match:
                 info['time'] = match.group(0)
+                info['lines']['time'] = line_no
                 break
         if info['time']:
             break
     
     # 장소 찾기
     location_keywords = ['장소', '위치', '주소', '에서', '교육실', '강당']
-    for line in lines:
+    for line_no, line in numbered:
         for keyword in location_keywords:
             if keyword in line:
                 info['location'] = line
+                info['lines']['location'] = line_no
                 break
         if info['location']:
             break
     
     # 대상 찾기
     target_keywords = ['대상', '참가자', '신청자', '이주민', '외국인']
-    for line in lines:
+    for line_no, line in numbered:
         for keyword in target_keywords:
             if keyword in line:
                 info['target'] = line
+                info['lines']['target'] = line_no
                 break
         if info['target']:
             break
     
     # 연락처 찾기
-    contact_patterns = [
-        r'0\d{1,2}-\d{3,4}-\d{4}',
-        r'\d{3}-\d{4}-\d{4}',
-        r'010-\d{4}-\d{4}'
-    ]
-    
-    for line in lines:
+    for line_no, line in numbered:
         if '연락' in line or '문의' in line or '전화' in line:
             info['contact'] = line
-            for pattern in contact_patterns:
+            info['lines']['contact'] = line_no
+            for pattern in CONTACT_PATTERNS:
                 match = re.search(pattern, line)
                 if match:
                     info['contact'] = line
@@ -191,10 +213,11 @@ def extract_key_info(text):
     
     # 신청 방법 찾기
     apply_keywords = ['신청', '접수', '등록', '참여방법']
-    for line in lines:
+    for line_no, line in numbered:
         for keyword in apply_keywords:
             if keyword in line:
                 info['how_to_apply'] = line
+                info['lines']['how_to_apply'] = line_no
                 break
         if info['how_to_apply']:
             break
@@ -311,93 +334,160 @@ def read_txt(file):
     """텍스트 파일 읽기"""
     return file.read().decode('utf-8')
 
-def translate_text(text, target_lang):
-    """텍스트 번역"""
-    try:
-        if target_lang == 'ko':
-            return text
-        
-        translator = GoogleTranslator(source='ko', target=target_lang)
-        return translator.translate(text)
-    except Exception as e:
-        st.warning(f"번역 실패 ({target_lang}): {str(e)}")
-        return text
+@st.cache_resource
+def get_archive():
+    """모든 세션이 함께 쓰는 공문 보관소"""
+    return archive.NoticeArchive()
+
+@st.cache_resource
+def get_translation_scheduler():
+    """모든 세션이 함께 쓰는 번역 스케줄러 (서킷 브레이커 상태도 공유)"""
+    notice_archive = get_archive()
+    
+    # 이전 공문에서 번역한 줄은 재사용하고 바뀐 줄만 번역
+    def translate_fn(text, lang):
+        translated, _ = notice_archive.translate(
+            text, lang, lambda chunk, chunk_lang: translation.translate(chunk, chunk_lang, GoogleTranslator)
+        )
+        return translated
+    
+    return translation.TranslationScheduler(translate_fn)
 
 # ============================================
 # 이미지 생성 함수
 # ============================================
 
-def create_promo_image(title, content, lang_code, size_type='social'):
+def create_promo_image(title, content, lang_code, size_type='social', template=poster.DEFAULT_TEMPLATE, logo_hash=None):
     """홍보 이미지 생성"""
     
-    # 크기 설정
-    if size_type == 'social':
-        width, height = 1080, 1080
-    else:  # a4
-        width, height = 2480, 3508
-    
-    # 배경 생성
-    img = Image.new('RGB', (width, height), 'white')
-    draw = ImageDraw.Draw(img)
-    
-    # 상단 파란색 바
-    header_height = int(height * 0.15)
-    draw.rectangle([(0, 0), (width, header_height)], fill=BRAND_COLOR)
-    
-    # 하단 주황색 바
-    footer_height = int(height * 0.05)
-    draw.rectangle(
-        [(0, height - footer_height), (width, height)], 
-        fill='#FF6B6B'
-    )
+    # 템플릿은 (템플릿, 크기)별로 한 번만 컴파일됨
+    program = poster.compile_template(template, size_type)
     
-    # 로고 추가 (있는 경우)
-    try:
-        if Path('logos/logo.png').exists():
-            logo = Image.open('logos/logo.png')
-            logo_width = int(width * 0.3)
-            logo_height = int(logo_width * logo.size[1] / logo.size[0])
-            logo = logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
-            
-            if logo.mode != 'RGBA':
-                logo = logo.convert('RGBA')
-            
-            img.paste(logo, (30, 30), logo)
-    except:
-        pass
-    
-    # 폰트 설정
-    try:
-        title_font = ImageFont.truetype("malgun.ttf", int(height * 0.05))
-        content_font = ImageFont.truetype("malgun.ttf", int(height * 0.025))
-    except:
-        try:
-            title_font = ImageFont.truetype("arial.ttf", int(height * 0.05))
-            content_font = ImageFont.truetype("arial.ttf", int(height * 0.025))
-        except:
-            title_font = ImageFont.load_default()
-            content_font = ImageFont.load_default()
-    
-    # 제목 그리기
-    title_y = int(height * 0.25)
-    title_clean = re.sub(r'[^\w\s가-힣]', '', title)
-    draw.text((50, title_y), title_clean[:50], fill='#333333', font=title_font)
-    
-    # 내용 그리기
-    content_y = int(height * 0.4)
-    lines = content.split('\n')[:8]
+    return poster.render(program, {'title': title, 'content': content}, logo_hash)
+
+@st.cache_resource
+def get_render_pool():
+    """폰트/템플릿/로고를 미리 읽어 둔 부모에서 fork되는 렌더 워커 풀 (쓸 수 없으면 None)"""
+    return render_pool.create_pool(RENDER_WORKERS)
+
+@st.cache_resource
+def get_render_flight():
+    """모든 세션이 함께 쓰는 이미지 생성 합치기"""
+    return singleflight.SingleFlight()
+
+def render_promo_png(title, content, lang_code, size_type, template, logo_hash, notice_archive, pool, flight):
+    """홍보 이미지를 PNG 바이트로 생성
+
+    이전에 같은 이미지를 만든 적이 있으면 보관소에서 꺼내고,
+    다른 세션이 같은 이미지를 만드는 중이면 그 결과를 기다림.
+    작업 스레드에서 불리므로 보관소/풀/합치기는 스크립트 스레드에서 받아 옴
+    """
+    key = '|'.join([
+        singleflight.text_hash(title + '\n' + content), lang_code, size_type,
+        template, poster.template_version(template), logo_hash or ''
+    ])
+    
+    png = notice_archive.get_render(key)
+    if png is not None:
+        return png
+    
+    def render():
+        if pool is not None:
+            png = pool.render(title, content, lang_code, size_type, template, logo_hash)
+        else:
+            png = encode_png(create_promo_image(title, content, lang_code, size_type, template, logo_hash))
+        notice_archive.store_render(key, png)
+        return png
     
-    for i, line in enumerate(lines):
-        y = content_y + (i * int(height * 0.04))
-        line_clean = re.sub(r'[^\w\s가-힣:/-]', '', line)
-        draw.text((50, y), line_clean[:60], fill='#333333', font=content_font)
+    return flight.do(key, render)
+
+# ============================================
+# 원문 보기 함수
+# ============================================
+
+def show_source(source_hash, line_fields):
+    """저장된 원문을 페이지 단위로 표시 (보이는 페이지의 줄만 읽어서 보냄)
+
+    line_fields: {항목 이름: 원문 줄 번호}, 추출할 때 기록한 줄을 강조
+    """
+    total = source_store.line_count(source_hash)
+    pages = max(1, -(-total // SOURCE_PAGE_LINES))
+    
+    marks = {}
+    for field, line_no in line_fields.items():
+        if field in SOURCE_FIELDS:
+            marks.setdefault(line_no, []).append(SOURCE_FIELDS[field])
+    
+    page = 1
+    if pages > 1:
+        page = st.number_input(
+            f"페이지 (전체 {pages}쪽)",
+            min_value=1,
+            max_value=pages,
+            value=1,
+            step=1,
+            key=f"source_page_{source_hash[:16]}"
+        )
     
-    return img
+    if marks:
+        st.caption("  ·  ".join(
+            f"{label} {line_no // SOURCE_PAGE_LINES + 1}쪽"
+            for line_no, labels in sorted(marks.items()) for label in labels
+        ))
+    
+    start = (page - 1) * SOURCE_PAGE_LINES
+    rows = []
+    for line_no, line in enumerate(source_store.read_lines(source_hash, start, SOURCE_PAGE_LINES), start=start):
+        row = html.escape(line) or '&nbsp;'
+        if line_no in marks:
+            row = f'<mark title="{", ".join(marks[line_no])}">{row}</mark>'
+        rows.append(row)
+    
+    st.markdown(f'<div class="original-box">{"<br>".join(rows)}</div>', unsafe_allow_html=True)
+    st.caption(f"{start + 1}–{start + len(rows)}줄 / 전체 {total}줄")
+
+# ============================================
+# 결과물 저장 함수
+# ============================================
+
+def build_zip(original, summary, promo, translations, images):
+    """원문, 요약, 홍보문, 번역문, 이미지를 ZIP으로 묶기"""
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        
+        # 원문 저장
+        zip_file.writestr("원문.txt", original.encode('utf-8'))
+        
+        # 요약 저장
+        zip_file.writestr("요약.txt", summary.encode('utf-8'))
+        
+        # 홍보문 저장
+        zip_file.writestr("홍보문_한국어.txt", promo.encode('utf-8'))
+        
+        # 번역문 저장
+        for lang_code, text in translations.items():
+            if lang_code != 'ko':
+                filename = f"번역문/홍보문_{lang_code}.txt"
+                zip_file.writestr(filename, text.encode('utf-8'))
+        
+        # 이미지 저장
+        for lang_code, size_dict in images.items():
+            for size_type, img_bytes in size_dict.items():
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                filename = f"이미지/홍보물_{lang_code}_{size_type}_{timestamp}.png"
+                zip_file.writestr(filename, img_bytes)
+    
+    zip_buffer.seek(0)
+    return zip_buffer
 
 # ============================================
 # 메인 UI
 # ============================================
 
+# 렌더 워커는 서버의 첫 스크립트 실행에서 화면을 그리기 전에 모두 띄워 둠
+# (워커를 띄우는 동안 __main__을 가리므로 다른 세션의 실행과 겹치는 구간을 줄임)
+get_render_pool()
+
 # 헤더
 st.markdown("""
 <div class="main-header">
@@ -411,17 +501,32 @@ st.markdown("""
 with st.sidebar:
     st.header("⚙️ 설정")
     
+    template_names = poster.list_templates()
+    template_name = st.selectbox(
+        "홍보물 템플릿",
+        template_names,
+        index=template_names.index(poster.DEFAULT_TEMPLATE),
+        format_func=lambda name: poster.load_template(name).get('name', name),
+        help="templates 폴더의 JSON/TOML 파일로 크기와 디자인을 추가할 수 있습니다"
+    )
+    
     logo_file = st.file_uploader(
         "로고 업로드 (선택사항)",
         type=['png', 'jpg', 'jpeg'],
         help="홍보물에 들어갈 로고를 업로드하세요"
     )
     
+    logo_hash = logo_store.default_logo_hash()
+    
     if logo_file:
-        Path('logos').mkdir(exist_ok=True)
-        with open('logos/logo.png', 'wb') as f:
-            f.write(logo_file.read())
-        st.success("✅ 로고 업로드 완료!")
+        try:
+            # 같은 로고는 한 번만 저장되고 크기별 변형도 한 번만 만들어짐
+            logo_hash = logo_store.ingest(logo_file.getvalue())
+            logo_store.precompute(logo_hash, poster.logo_widths(template_name))
+            st.success("✅ 로고 업로드 완료!")
+        except Exception as e:
+            logo_hash = logo_store.default_logo_hash()
+            st.error(f"❌ 로고 읽기 실패: {str(e)}")
     
     st.markdown("---")
     
@@ -444,6 +549,17 @@ with st.sidebar:
     4. 다국어 번역
     5. 이미지 생성
     """)
+    
+    with st.expander("📈 중복 작업 합치기 현황"):
+        st.caption("여러 명이 같은 공문으로 동시에 생성하면 번역과 이미지 생성을 한 번만 합니다")
+        for label, stats in [
+            ("번역", get_translation_scheduler().flight.stats()),
+            ("이미지", get_render_flight().stats())
+        ]:
+            st.markdown(
+                f"**{label}**: 요청 {stats['calls']} · 실행 {stats['executed']} · "
+                f"합침 {stats['coalesced']} · 진행 중 {stats['inflight']}"
+            )
 
 # 메인 영역
 tab1, tab2, tab3 = st.tabs(["📝 공문 입력 & 생성", "💡 예시 보기", "ℹ️ 사용 방법"])
@@ -505,8 +621,14 @@ with tab1:
     
     # 원문 표시
     if text_content and len(text_content) > 10:
+        # 원문은 해시로 디스크에 한 번만 저장하고 세션에는 해시만 둠
+        source_hash = source_store.put(text_content)
+        
         with st.expander("📄 원문 보기"):
-            st.markdown(f'<div class="original-box">{text_content}</div>', unsafe_allow_html=True)
+            line_fields = {}
+            if st.session_state.get('source_hash') == source_hash:
+                line_fields = st.session_state['info'].get('lines', {})
+            show_source(source_hash, line_fields)
         
         # AI 요약 버튼
         st.markdown("---")
@@ -522,8 +644,16 @@ with tab1:
         
         if analyze_button:
             with st.spinner("🤖 AI가 공문을 분석하고 있습니다..."):
-                # 정보 추출
-                info = extract_key_info(text_content)
+                # 비슷한 이전 공문 찾기 (MinHash 서명은 찾기와 저장에 함께 씀)
+                signature = archive.minhash(text_content)
+                similar = get_archive().find_similar(text_content, signature=signature)
+                
+                # 정보 추출 (완전히 같은 공문이면 이전 결과 재사용)
+                if similar and similar['exact']:
+                    info = similar['info']
+                else:
+                    info = extract_key_info(text_content)
+                get_archive().save_notice(text_content, info, signature=signature)
                 
                 # 요약 생성
                 summary = create_summary(info)
@@ -532,12 +662,19 @@ with tab1:
                 promo = create_promo_text(info)
                 
                 # 세션에 저장
-                st.session_state['original'] = text_content
+                st.session_state['source_hash'] = source_hash
                 st.session_state['summary'] = summary
                 st.session_state['promo'] = promo
                 st.session_state['info'] = info
             
             st.success("✅ 분석 완료!")
+            
+            if similar:
+                st.info(
+                    f"📚 비슷한 이전 공문을 찾았습니다 (유사도 {similar['similarity']:.0%}, {similar['created_at'][:10]}): "
+                    f"{similar['info'].get('title', '')}  \n"
+                    "이전에 번역한 문장과 만든 이미지는 다시 쓰고 바뀐 부분만 새로 처리합니다."
+                )
     
     # 분석 결과 표시
     if 'promo' in st.session_state:
@@ -561,6 +698,19 @@ with tab1:
         
         st.session_state['promo'] = edited_promo
         
+        # 분석이 끝나면 바로 백그라운드에서 번역을 시작하고, 홍보문이 바뀌면 다시 시작
+        prefetch = st.session_state.get('prefetch')
+        if prefetch is None or prefetch.text != edited_promo:
+            if prefetch is not None:
+                prefetch.cancel()
+            prefetch_langs = [
+                lang_code for lang_code in LANGUAGES
+                if lang_code != 'ko' and st.session_state.get(f"lang_{lang_code}", True)
+            ]
+            st.session_state['prefetch'] = get_translation_scheduler().prefetch(
+                edited_promo, prefetch_langs, deadline=TRANSLATION_DEADLINE
+            )
+        
         st.markdown(f'<div class="promo-box">{edited_promo}</div>', unsafe_allow_html=True)
         
         # 언어 선택
@@ -588,10 +738,13 @@ with tab1:
         # 이미지 크기 선택
         st.header("4️⃣ 이미지 크기 선택")
         
+        template_sizes = poster.template_sizes(template_name)
+        
         size_options = st.multiselect(
             "생성할 이미지 크기를 선택하세요",
-            ["소셜미디어용 (1080x1080)", "A4 인쇄용 (2480x3508)"],
-            default=["소셜미디어용 (1080x1080)", "A4 인쇄용 (2480x3508)"]
+            list(template_sizes),
+            default=[size_type for size_type, spec in template_sizes.items() if spec[3]],
+            format_func=lambda size_type: "{} ({}x{})".format(*template_sizes[size_type][:3])
         )
         
         # 생성 버튼
@@ -617,52 +770,77 @@ with tab1:
                 
                 # 번역
                 status_text.text("🌏 번역 중...")
+                translation_start = time.monotonic()
                 
-                for lang_code in selected_langs:
-                    lang_name = LANGUAGES[lang_code]
-                    status_text.text(f"🌏 번역 중... {lang_name}")
-                    
-                    translated = translate_text(edited_promo, lang_code)
-                    translations[lang_code] = translated
-                    
-                    current_step += 1
-                    progress_bar.progress(current_step / total_steps)
+                # 미리 시작한 번역이 있으면 끝나기를 기다렸다가 그 결과를 씀
+                prefetch = st.session_state.get('prefetch')
+                if prefetch is not None and prefetch.text == edited_promo and not prefetch.done():
+                    status_text.text("🌏 미리 시작한 번역을 마무리하는 중...")
+                    prefetch.wait(TRANSLATION_DEADLINE)
+                
+                finished_langs = []
+                
+                def on_translated(lang_code, translated):
+                    finished_langs.append(lang_code)
+                    progress_bar.progress(len(finished_langs) / total_steps)
+                    status_text.text(f"🌏 번역 중... {LANGUAGES[lang_code]} 완료")
+                
+                # 언어들을 동시에 번역하되 전체 마감 시간을 넘기지 않음
+                translations, pending_langs = get_translation_scheduler().translate_batch(
+                    edited_promo,
+                    selected_langs,
+                    deadline=max(0.0, TRANSLATION_DEADLINE - (time.monotonic() - translation_start)),
+                    on_result=on_translated
+                )
+                
+                if pending_langs:
+                    for lang_code in pending_langs:
+                        translations[lang_code] = edited_promo
                     
-                    time.sleep(0.5)
+                    pending_names = ', '.join(LANGUAGES[lang] for lang in pending_langs)
+                    st.warning(
+                        f"⏳ 번역 서버 응답이 늦어 {pending_names} 번역은 한국어로 대신 만들었습니다. "
+                        "백그라운드에서 계속 번역 중이니 잠시 후 다시 생성하면 반영됩니다."
+                    )
+                
+                # 화면의 언어 순서대로 정렬
+                translations = {lang: translations[lang] for lang in selected_langs}
+                
+                current_step = len(selected_langs)
+                progress_bar.progress(current_step / total_steps)
                 
                 # 이미지 생성
                 status_text.text("🎨 이미지 생성 중...")
                 
-                for lang_code, translated_text in translations.items():
-                    lang_name = LANGUAGES[lang_code]
-                    
-                    # 제목과 내용 분리
-                    lines = translated_text.split('\n')
-                    title = lines[0][:100] if lines else "공지사항"
-                    content = '\n'.join(lines[1:]) if len(lines) > 1 else translated_text
-                    
-                    images[lang_code] = {}
-                    
-                    for size_option in size_options:
-                        if "소셜" in size_option:
-                            size_type = 'social'
-                            size_name = '소셜미디어'
-                        else:
-                            size_type = 'a4'
-                            size_name = 'A4'
+                # 워커 풀이 있으면 여러 이미지를 동시에 그림
+                render_jobs = {}
+                render_resources = (get_archive(), get_render_pool(), get_render_flight())
+                with ThreadPoolExecutor(max_workers=RENDER_WORKERS) as render_executor:
+                    for lang_code, translated_text in translations.items():
                         
-                        status_text.text(f"🎨 이미지 생성 중... {lang_name} ({size_name})")
+                        # 제목과 내용 분리
+                        lines = translated_text.split('\n')
+                        title = lines[0][:100] if lines else "공지사항"
+                        content = '\n'.join(lines[1:]) if len(lines) > 1 else translated_text
+                        
+                        images[lang_code] = {}
+                        
+                        for size_type in size_options:
+                            job = render_executor.submit(
+                                render_promo_png, title, content, lang_code, size_type, template_name, logo_hash,
+                                *render_resources
+                            )
+                            render_jobs[job] = (lang_code, size_type)
+                    
+                    for job in as_completed(render_jobs):
+                        lang_code, size_type = render_jobs[job]
+                        lang_name = LANGUAGES[lang_code]
+                        size_name = template_sizes[size_type][0]
                         
                         try:
-                            img = create_promo_image(title, content, lang_code, size_type)
-                            
-                            # 이미지를 바이트로 변환
-                            img_byte_arr = io.BytesIO()
-                            img.save(img_byte_arr, format='PNG')
-                            img_byte_arr.seek(0)
-                            
-                            images[lang_code][size_type] = img_byte_arr.getvalue()
-                            
+                            images[lang_code][size_type] = job.result()
+                            status_text.text(f"🎨 이미지 생성 중... {lang_name} ({size_name}) 완료")
+                        
                         except Exception as e:
                             st.warning(f"⚠️ {lang_name} {size_name} 생성 실패: {str(e)}")
                         
@@ -695,20 +873,19 @@ with tab1:
                         
                         cols = st.columns(len(size_options))
                         
-                        for col_idx, size_option in enumerate(size_options):
-                            size_type = 'social' if "소셜" in size_option else 'a4'
-                            size_name = '소셜미디어' if size_type == 'social' else 'A4'
+                        for col_idx, size_type in enumerate(size_options):
+                            size_name = template_sizes[size_type][0]
                             
                             with cols[col_idx]:
                                 if size_type in images.get(lang_code, {}):
                                     img_bytes = images[lang_code][size_type]
-                                    st.image(img_bytes, caption=f"{size_name}용", use_container_width=True)
+                                    st.image(img_bytes, caption=size_name, use_container_width=True)
                                     
                                     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                                     filename = f"홍보물_{lang_code}_{size_type}_{timestamp}.png"
                                     
                                     st.download_button(
-                                        label=f"💾 {size_name}용 다운로드",
+                                        label=f"💾 {size_name} 다운로드",
                                         data=img_bytes,
                                         file_name=filename,
                                         mime="image/png",
@@ -719,32 +896,13 @@ with tab1:
                 st.markdown("---")
                 st.subheader("📦 전체 다운로드")
                 
-                zip_buffer = io.BytesIO()
-                with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                    
-                    # 원문 저장
-                    zip_file.writestr("원문.txt", st.session_state['original'].encode('utf-8'))
-                    
-                    # 요약 저장
-                    zip_file.writestr("요약.txt", st.session_state['summary'].encode('utf-8'))
-                    
-                    # 홍보문 저장
-                    zip_file.writestr("홍보문_한국어.txt", edited_promo.encode('utf-8'))
-                    
-                    # 번역문 저장
-                    for lang_code, text in translations.items():
-                        if lang_code != 'ko':
-                            filename = f"번역문/홍보문_{lang_code}.txt"
-                            zip_file.writestr(filename, text.encode('utf-8'))
-                    
-                    # 이미지 저장
-                    for lang_code, size_dict in images.items():
-                        for size_type, img_bytes in size_dict.items():
-                            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                            filename = f"이미지/홍보물_{lang_code}_{size_type}_{timestamp}.png"
-                            zip_file.writestr(filename, img_bytes)
-                
-                zip_buffer.seek(0)
+                zip_buffer = build_zip(
+                    source_store.read_text(st.session_state['source_hash']),
+                    st.session_state['summary'],
+                    edited_promo,
+                    translations,
+                    images
+                )
                 
                 st.download_button(
                     label="📦 전체 파일 다운로드 (ZIP)",
@@ -837,6 +995,9 @@ with tab3:
     #### 5️⃣ 이미지 크기 선택
     - 소셜미디어용 (1080x1080)
     - A4 인쇄용 (2480x3508)
+    - 인스타그램 스토리용 (1080x1920)
+    - 배너용 (1920x640)
+    - templates 폴더에 JSON/TOML 템플릿을 추가하면 새 크기와 디자인을 코드 수정 없이 사용할 수 있습니다
     
     #### 6️⃣ 생성 & 다운로드
     - "생성 시작" 버튼 클릭
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""
+공문 보관소 - 분석한 공문과 줄 단위 번역, 생성한 이미지를 SQLite에 보관하고
+MinHash(LSH)와 FTS5로 비슷한 이전 공문을 빠르게 찾아 재사용
+
+공문 원문은 source_store에 해시로 한 번만 저장하고 여기에는 해시만 둠
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+
+import numpy as np
+
+import source_store
+from singleflight import text_hash
+
+# 보관소 폴더는 환경 변수로 바꿀 수 있음 (벤치마크는 매번 빈 임시 폴더를 씀)
+ARCHIVE_DIR_ENV = 'PROMO_ARCHIVE_DIR'
+DEFAULT_ARCHIVE_DIR = Path(__file__).parent / 'archive'
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE = 3
+SIMILARITY_THRESHOLD = 0.5
+# MinHash를 한 번에 계산할 shingle 수 (긴 공문도 중간 행렬이 MINHASH_CHUNK × NUM_PERM을 넘지 않음)
+MINHASH_CHUNK = 4096
+MAX_RENDERS = 500
+
+# MinHash 순열 (a * h + b) mod 2^32, 항상 같은 값이 되도록 고정 seed
+_rng = np.random.RandomState(20250115)
+_PERM_A = _rng.randint(1, 2 ** 32 - 1, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.randint(0, 2 ** 32 - 1, size=NUM_PERM, dtype=np.uint64)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notices (
+    id INTEGER PRIMARY KEY,
+    source_hash TEXT UNIQUE NOT NULL,
+    info TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS notice_bands (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    notice_id INTEGER NOT NULL REFERENCES notices(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS notice_bands_lookup ON notice_bands (band, bucket);
+CREATE TABLE IF NOT EXISTS line_translations (
+    line_hash TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    translated TEXT NOT NULL,
+    PRIMARY KEY (line_hash, lang)
+);
+CREATE TABLE IF NOT EXISTS renders (
+    key TEXT PRIMARY KEY,
+    png BLOB NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+# ============================================
+# MinHash
+# ============================================
+
+def _normalize(text):
+    """공백을 없애 줄바꿈/띄어쓰기 차이는 무시"""
+    return re.sub(r'\s+', '', text)
+
+def minhash(text):
+    """글자 3-gram 집합의 MinHash 서명 (uint32 NUM_PERM개)
+
+    shingle 해시를 MINHASH_CHUNK개씩 순열에 넣어 지금까지의 최솟값과 비교하므로
+    공문 길이와 상관없이 중간 메모리가 일정함
+    """
+    text = _normalize(text)
+    shingles = {text[i:i + SHINGLE] for i in range(max(1, len(text) - SHINGLE + 1))}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles)
+    )
+    signature = np.full(NUM_PERM, 0xFFFFFFFF, dtype=np.uint64)
+    for start in range(0, len(hashes), MINHASH_CHUNK):
+        chunk = hashes[start:start + MINHASH_CHUNK]
+        permuted = (chunk[:, None] * _PERM_A[None, :] + _PERM_B[None, :]) & np.uint64(0xFFFFFFFF)
+        np.minimum(signature, permuted.min(axis=0), out=signature)
+    return signature.astype(np.uint32)
+
+def similarity(sig_a, sig_b):
+    """두 서명으로 추정한 Jaccard 유사도"""
+    return float(np.mean(sig_a == sig_b))
+
+def _band_buckets(signature):
+    """LSH 밴드별 버킷 값 (SQLite 정수 범위)"""
+    buckets = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        buckets.append(int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), 'little', signed=True))
+    return buckets
+
+def archive_dir():
+    """보관소 폴더 (PROMO_ARCHIVE_DIR가 있으면 그 폴더)"""
+    return Path(os.environ.get(ARCHIVE_DIR_ENV) or DEFAULT_ARCHIVE_DIR)
+
+def _line_hash(line):
+    return text_hash(line.strip())
+
+# ============================================
+# 보관소
+# ============================================
+
+class NoticeArchive:
+    """분석한 공문, 줄 단위 번역, 생성한 이미지 보관소"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path is not None else archive_dir() / 'notices.db'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            try:
+                # 후보 id만 찾으면 되므로 내용은 저장하지 않는 색인
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS notices_fts USING fts5(title, text, content='')"
+                )
+                self.fts = True
+            except sqlite3.OperationalError:  # FTS5 없이 빌드된 SQLite
+                self.fts = False
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute('PRAGMA foreign_keys=ON')
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # 공문
+
+    def save_notice(self, text, info, signature=None):
+        """분석한 공문 저장 (같은 내용이면 info만 갱신), id 반환
+
+        signature는 이미 계산한 minhash(text) (없으면 여기서 계산)
+        """
+        if signature is None:
+            signature = minhash(text)
+        key = source_store.put(text)
+        now = datetime.now().isoformat(timespec='seconds')
+
+        with self._write_lock, self._connect() as conn:
+            row = conn.execute('SELECT id FROM notices WHERE source_hash = ?', (key,)).fetchone()
+            if row:
+                conn.execute('UPDATE notices SET info = ? WHERE id = ?', (json.dumps(info, ensure_ascii=False), row[0]))
+                return row[0]
+
+            notice_id = conn.execute(
+                'INSERT INTO notices (source_hash, info, signature, created_at) VALUES (?, ?, ?, ?)',
+                (key, json.dumps(info, ensure_ascii=False), signature.tobytes(), now)
+            ).lastrowid
+            conn.executemany(
+                'INSERT INTO notice_bands (band, bucket, notice_id) VALUES (?, ?, ?)',
+                [(band, bucket, notice_id) for band, bucket in enumerate(_band_buckets(signature))]
+            )
+            if self.fts:
+                conn.execute(
+                    'INSERT INTO notices_fts (rowid, title, text) VALUES (?, ?, ?)',
+                    (notice_id, info.get('title', ''), text)
+                )
+            return notice_id
+
+    def _fts_candidates(self, conn, text, limit=5):
+        """제목 단어로 전문 검색한 후보 id"""
+        first_line = next((line for line in text.split('\n') if line.strip()), '')
+        tokens = list(dict.fromkeys(re.findall(r'[\w가-힣]{2,}', first_line)))[:8]
+        if not tokens:
+            return []
+        query = ' OR '.join(f'"{token}"' for token in tokens)
+        try:
+            rows = conn.execute(
+                'SELECT rowid FROM notices_fts WHERE notices_fts MATCH ? ORDER BY rank LIMIT ?',
+                (query, limit)
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return []
+        return [row[0] for row in rows]
+
+    def find_similar(self, text, threshold=SIMILARITY_THRESHOLD, signature=None):
+        """가장 비슷한 이전 공문 {'id', 'similarity', 'exact', 'source_hash', 'info', 'created_at'} (없으면 None)
+
+        similarity는 MinHash 추정치라 1.0이어도 내용이 다를 수 있음. 같은 내용인지는 exact로 판단.
+        원문은 source_store.read_text(source_hash)로 읽음. signature는 save_notice와 같음
+        """
+        key = text_hash(text)
+        if signature is None:
+            signature = minhash(text)
+
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT id, source_hash, info, created_at FROM notices WHERE source_hash = ?', (key,)
+            ).fetchone()
+            if row:
+                return {
+                    'id': row[0], 'similarity': 1.0, 'exact': True, 'source_hash': row[1],
+                    'info': json.loads(row[2]), 'created_at': row[3]
+                }
+
+            buckets = _band_buckets(signature)
+            clauses = ' OR '.join(['(band = ? AND bucket = ?)'] * BANDS)
+            params = [value for pair in enumerate(buckets) for value in pair]
+            candidates = {r[0] for r in conn.execute(
+                f'SELECT DISTINCT notice_id FROM notice_bands WHERE {clauses}', params
+            )}
+            if not candidates and self.fts:
+                candidates = set(self._fts_candidates(conn, text))
+            if not candidates:
+                return None
+
+            placeholders = ','.join('?' * len(candidates))
+            rows = conn.execute(
+                f'SELECT id, source_hash, info, signature, created_at FROM notices WHERE id IN ({placeholders})',
+                list(candidates)
+            ).fetchall()
+
+        best = None
+        for notice_id, source_hash, info, old_signature, created_at in rows:
+            score = similarity(signature, np.frombuffer(old_signature, dtype=np.uint32))
+            if score >= threshold and (best is None or score > best['similarity']):
+                best = {
+                    'id': notice_id, 'similarity': score, 'exact': False, 'source_hash': source_hash,
+                    'info': json.loads(info), 'created_at': created_at
+                }
+        return best
+
+    # 줄 단위 번역
+
+    def lookup_lines(self, lines, lang):
+        """줄별 이전 번역 {줄 해시: 번역}"""
+        hashes = list({_line_hash(line) for line in lines if line.strip()})
+        if not hashes:
+            return {}
+        found = {}
+        with self._connect() as conn:
+            for i in range(0, len(hashes), 500):
+                chunk = hashes[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                found.update(conn.execute(
+                    f'SELECT line_hash, translated FROM line_translations '
+                    f'WHERE lang = ? AND line_hash IN ({placeholders})',
+                    [lang] + chunk
+                ).fetchall())
+        return found
+
+    def store_lines(self, pairs, lang):
+        """(원문 줄, 번역 줄) 목록 저장"""
+        rows = [(_line_hash(src), lang, dst) for src, dst in pairs if src.strip()]
+        if not rows:
+            return
+        with self._write_lock, self._connect() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO line_translations (line_hash, lang, translated) VALUES (?, ?, ?)',
+                rows
+            )
+
+    def translate(self, text, lang, translate_fn):
+        """이전에 번역한 줄은 재사용하고 바뀐 줄만 translate_fn(텍스트, 언어)으로 번역
+
+        반환: (번역문, 재사용한 줄 수)
+        """
+        if lang == 'ko':
+            return text, 0
+
+        lines = text.split('\n')
+        known = self.lookup_lines(lines, lang)
+        missing = [line for line in lines if line.strip() and _line_hash(line) not in known]
+
+        if missing:
+            translated = translate_fn('\n'.join(missing), lang).split('\n')
+            if len(translated) != len(missing):
+                # 줄이 맞지 않으면 줄 단위로 나눌 수 없으니 전체를 번역
+                return translate_fn(text, lang), 0
+            self.store_lines(zip(missing, translated), lang)
+            known.update((_line_hash(src), dst) for src, dst in zip(missing, translated))
+
+        result = [known[_line_hash(line)] if line.strip() else line for line in lines]
+        reused = sum(1 for line in lines if line.strip()) - len(missing)
+        return '\n'.join(result), reused
+
+    # 이미지
+
+    def get_render(self, key):
+        """이전에 만든 이미지 PNG 바이트 (없으면 None)"""
+        with self._connect() as conn:
+            row = conn.execute('SELECT png FROM renders WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def store_render(self, key, png):
+        """이미지 저장, 오래된 것부터 MAX_RENDERS개만 남김"""
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._write_lock, self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO renders (key, png, created_at) VALUES (?, ?, ?)',
+                (key, png, now)
+            )
+            conn.execute(
+                'DELETE FROM renders WHERE key NOT IN '
+                '(SELECT key FROM renders ORDER BY created_at DESC LIMIT ?)',
+                (MAX_RENDERS,)
+            )
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+코끼리공장 홍보물 생성기 벤치마크 (python -m benchmarks.run)
+"""
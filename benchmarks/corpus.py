@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크용 합성 공문 생성기 - 일시/장소/대상/신청/문의 줄이 들어간 한국어 공문과 docx/pdf 파일
+"""
+
+import docx
+import random
+
+PROGRAMS = [
+    '이주민 한국어 교육 프로그램', '다문화 가정 요리 교실', '외국인 근로자 법률 상담',
+    '이주 여성 취업 역량 강화 교육', '다문화 어린이 미술 교실', '외국인 주민 건강 검진',
+    '한국 생활 적응 교육', '이주민 컴퓨터 기초 교육', '세계 문화 축제 자원봉사자 모집'
+]
+KINDS = ['안내', '공고', '모집 안내', '운영 안내', '참가자 모집']
+PLACES = [
+    '코끼리공장 2층 교육실', '코끼리공장 1층 강당', '울산 중구 문화의전당 소회의실',
+    '남구 다문화가족지원센터 교육실', '동구 주민센터 3층 강당'
+]
+TARGETS = [
+    '울산 거주 이주민 누구나', '결혼 이주 여성 및 가족', '외국인 근로자 (선착순 30명)',
+    '다문화 가정 초등학생', '한국어 초급 학습자'
+]
+APPLY = [
+    '전화 또는 방문 접수', '온라인 신청서 작성 후 이메일 접수', '당일 현장 접수 가능',
+    '담당자에게 문자로 이름과 연락처 전송'
+]
+FILLER = [
+    '코끼리공장에서는 지역 이주민의 안정적인 정착을 돕기 위해 다양한 프로그램을 운영하고 있습니다.',
+    '참가비는 무료이며 교재와 간식이 제공됩니다.',
+    '수업은 기초부터 차근차근 진행되므로 처음 배우는 분도 부담 없이 참여할 수 있습니다.',
+    '자세한 일정은 사정에 따라 변경될 수 있으니 참여 전 확인 부탁드립니다.',
+    '통역 지원이 필요한 분은 신청 시 미리 말씀해 주시기 바랍니다.',
+    '주차 공간이 협소하오니 가급적 대중교통을 이용해 주시기 바랍니다.',
+    '프로그램 종료 후 수료증을 발급해 드립니다.',
+    '개인정보는 프로그램 운영 목적으로만 사용되며 종료 후 파기됩니다.'
+]
+
+def generate_notice(rng, body_lines=10):
+    """공문 하나 생성 (body_lines로 본문 길이 조절)"""
+    month = rng.randint(1, 12)
+    day = rng.randint(1, 28)
+    hour = rng.randint(9, 18)
+
+    lines = [
+        f"{rng.choice(PROGRAMS)} {rng.choice(KINDS)}",
+        '',
+        "1. 목적: 이주민의 지역사회 적응 지원",
+        f"2. 일시: 2025년 {month}월 {day}일 {hour}:{rng.choice(['00', '30'])}",
+        f"3. 장소: {rng.choice(PLACES)}",
+        f"4. 대상: {rng.choice(TARGETS)}",
+        f"5. 신청: {rng.choice(APPLY)}",
+        f"6. 문의: 052-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        ''
+    ]
+    lines.extend(rng.choice(FILLER) for _ in range(body_lines))
+    return '\n'.join(lines)
+
+def generate_corpus(count, body_lines=10, seed=0):
+    """같은 seed면 항상 같은 공문 목록 생성"""
+    rng = random.Random(seed)
+    return [generate_notice(rng, body_lines) for _ in range(count)]
+
+# ============================================
+# 파일 생성
+# ============================================
+
+def write_docx(text, path):
+    """텍스트를 워드 파일로 저장"""
+    doc = docx.Document()
+    for line in text.split('\n'):
+        doc.add_paragraph(line)
+    doc.save(path)
+
+def _pdf_string(text):
+    """Identity-H 인코딩용 UTF-16BE 16진 문자열"""
+    return '<' + text.encode('utf-16-be').hex().upper() + '>'
+
+def write_pdf(text, path, lines_per_page=45):
+    """텍스트를 PDF로 저장 (한글 추출이 되도록 ToUnicode 포함, 폰트 미포함)"""
+    lines = text.split('\n')
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    cmap = (
+        b"/CIDInit /ProcSet findresource begin\n12 dict begin\nbegincmap\n"
+        b"/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n"
+        b"/CMapName /Adobe-Identity-UCS def\n/CMapType 2 def\n"
+        b"1 begincodespacerange\n<0000> <FFFF>\nendcodespacerange\n"
+        b"1 beginbfrange\n<0000> <FFFF> <0000>\nendbfrange\n"
+        b"endcmap\nCMapName currentdict /CMap defineresource pop\nend\nend\n"
+    )
+    to_unicode = add(b"<< /Length %d >>\nstream\n" % len(cmap) + cmap + b"\nendstream")
+    descriptor = add(
+        b"<< /Type /FontDescriptor /FontName /MalgunGothic /Flags 4 "
+        b"/FontBBox [0 -200 1000 900] /ItalicAngle 0 /Ascent 900 /Descent -200 "
+        b"/CapHeight 700 /StemV 80 >>"
+    )
+    cid_font = add(
+        b"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /MalgunGothic "
+        b"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+        b"/FontDescriptor %d 0 R /DW 1000 >>" % descriptor
+    )
+    font = add(
+        b"<< /Type /Font /Subtype /Type0 /BaseFont /MalgunGothic /Encoding /Identity-H "
+        b"/DescendantFonts [%d 0 R] /ToUnicode %d 0 R >>" % (cid_font, to_unicode)
+    )
+
+    pages_id = len(objects) + 1
+    objects.append(None)  # Pages 객체 자리
+
+    page_ids = []
+    for page_lines in pages:
+        ops = ['BT', '/F1 11 Tf', '14 TL', '50 800 Td']
+        for line in page_lines:
+            ops.append(f"{_pdf_string(line)} Tj T*")
+        ops.append('ET')
+        content = '\n'.join(ops).encode('ascii')
+        stream = add(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font, stream)
+        ))
+
+    kids = b' '.join(b"%d 0 R" % i for i in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog, xref
+    )
+
+    with open(path, 'wb') as f:
+        f.write(bytes(out))
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+동시 세션 부하 테스트 - AppTest 세션 N개가 동시에 공문 입력, 분석, 생성까지 실행
+
+사용법:
+    python -m benchmarks.loadtest --sessions 1 2 4 8 --output load.json
+
+세션은 실제 서버처럼 한 프로세스 안의 스레드로 돌고, 번역기는 로컬 대역으로 바뀜.
+AppTest는 파일 업로드를 흉내낼 수 없어서 공문은 직접 입력 칸으로 넣음.
+이미지는 렌더 워커 프로세스에서 그려지므로 CPU 시간과 메모리는 자식 프로세스까지 합쳐서 셈
+(/proc이 없는 환경에서는 이 프로세스만).
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import deep_translator
+import streamlit as st
+from streamlit import config
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.corpus import generate_notice
+from benchmarks.run import git_commit
+from benchmarks.stubs import stub_translator
+
+APP_PATH = str(Path(__file__).parent.parent / 'app.py')
+
+# ============================================
+# 메모리 측정
+# ============================================
+
+def _child_pids():
+    """이 프로세스의 자손 pid 목록 (forkserver와 그 아래 렌더 워커 포함)"""
+    children = {}
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return []
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # 두 번째 필드(실행 파일 이름)에 공백이 있을 수 있으므로 ')' 뒤부터 읽음
+                fields = f.read().rpartition(')')[2].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+
+    found = []
+    stack = [os.getpid()]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+def tree_cpu_seconds():
+    """이 프로세스와 자식 프로세스들이 쓴 CPU 시간 (초)"""
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)  # 이미 끝나 회수된 자식
+    total = time.process_time() + usage.ru_utime + usage.ru_stime
+
+    ticks = os.sysconf('SC_CLK_TCK')
+    for pid in _child_pids():
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                fields = f.read().rpartition(')')[2].split()
+        except OSError:
+            continue
+        # utime, stime (stat의 14, 15번째 필드)
+        total += (int(fields[11]) + int(fields[12])) / ticks
+    return total
+
+def _pss(pid):
+    """pid의 PSS (바이트), 읽을 수 없으면 None"""
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+def tree_memory():
+    """이 프로세스와 자식 프로세스들의 PSS 합 (바이트)
+
+    워커끼리 copy-on-write로 공유하는 페이지는 나눠서 세므로 중복되지 않음.
+    smaps_rollup이 없으면 이 프로세스의 RSS
+    """
+    own = _pss(os.getpid())
+    if own is None:
+        return current_rss()
+    return own + sum(_pss(pid) or 0 for pid in _child_pids())
+
+def current_rss():
+    """현재 RSS (바이트), /proc이 없으면 최대 RSS로 대신함"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+class RssSampler:
+    """백그라운드에서 메모리를 주기적으로 읽어 최댓값 기록
+
+    peak: 이 프로세스의 RSS, peak_total: 자식 프로세스까지 합친 PSS
+    """
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = current_rss()
+        self.peak_total = tree_memory()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        self.peak = max(self.peak, current_rss())
+        self.peak_total = max(self.peak_total, tree_memory())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+# ============================================
+# 세션 시나리오
+# ============================================
+
+def _button(at, label):
+    """라벨로 버튼 찾기"""
+    for button in at.button:
+        if button.label == label:
+            return button
+    raise LookupError(f"버튼을 찾을 수 없습니다: {label}")
+
+def run_session(notice, timeout):
+    """세션 하나: 공문 입력 → 분석 시작 → 번역 및 이미지 생성, 단계별 시간(초) 반환"""
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    start = time.perf_counter()
+
+    at.run()
+    at.radio[0].set_value("✏️ 직접 입력").run()
+    at.text_area[0].set_value(notice).run()
+    loaded = time.perf_counter()
+
+    _button(at, "🤖 분석 시작").click().run()
+    analyzed = time.perf_counter()
+
+    _button(at, "🚀 번역 및 이미지 생성 시작!").click().run()
+    generated = time.perf_counter()
+
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    if not any('생성 완료' in s.value for s in at.success):
+        raise RuntimeError("생성 완료 메시지가 없습니다")
+
+    return {
+        'input': loaded - start,
+        'analyze': analyzed - loaded,
+        'generate': generated - analyzed,
+        'total': generated - start
+    }
+
+def percentile(values, q):
+    """q 백분위수 (0~100, 선형 보간)"""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    pos = (len(ordered) - 1) * q / 100
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+def level_notices(seed, level, sessions, rounds):
+    """실행마다 다른 공문 (seed, 단계, 회차, 세션 번호로 정해지므로 같은 인자면 항상 같음)
+
+    같은 공문을 다시 넣으면 이미지/번역 캐시에 맞아 뒤 단계일수록 빨라 보이므로 겹치지 않게 함
+    """
+    return [
+        generate_notice(random.Random(f'{seed}:{level}:{round_}:{i}'), body_lines=10)
+        for round_ in range(rounds)
+        for i in range(sessions)
+    ]
+
+def run_level(sessions, notices, timeout):
+    """세션 sessions개를 동시에 돌려 notices를 하나씩 실행한 결과 통계"""
+    timings = []
+    errors = []
+
+    cpu_start = tree_cpu_seconds()
+    wall_start = time.perf_counter()
+
+    with RssSampler() as sampler, ThreadPoolExecutor(max_workers=sessions) as pool:
+        jobs = [
+            pool.submit(run_session, notice, timeout)
+            for notice in notices
+        ]
+        for job in jobs:
+            try:
+                timings.append(job.result())
+            except Exception as e:
+                errors.append(str(e))
+
+    wall = time.perf_counter() - wall_start
+    cpu = tree_cpu_seconds() - cpu_start
+    runs = len(timings) + len(errors)
+
+    result = {
+        'sessions': sessions,
+        'runs': runs,
+        'errors': errors,
+        'wall_seconds': wall,
+        'cpu_seconds_per_session': cpu / runs if runs else 0.0,
+        'peak_rss_mb': sampler.peak / (1024 * 1024),
+        'peak_total_pss_mb': sampler.peak_total / (1024 * 1024)
+    }
+    for stage in ('total', 'analyze', 'generate'):
+        values = [t[stage] for t in timings]
+        if values:
+            result[stage] = {
+                'p50': percentile(values, 50),
+                'p95': percentile(values, 95),
+                'mean': statistics.mean(values),
+                'max': max(values)
+            }
+    return result
+
+# ============================================
+# 실행
+# ============================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="코끼리공장 홍보물 생성기 동시 세션 부하 테스트")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8], help="동시 세션 수 목록")
+    parser.add_argument('--rounds', type=int, default=2, help="세션 수마다 반복할 횟수")
+    parser.add_argument('--translate-latency', type=float, default=0.2, help="번역기 대역의 호출당 지연(초)")
+    parser.add_argument('--timeout', type=float, default=300, help="스크립트 실행 한 번의 제한 시간(초)")
+    parser.add_argument('--seed', type=int, default=0, help="공문 생성 seed")
+    parser.add_argument('--output', help="JSON 보고서 저장 경로 (없으면 표준 출력)")
+    args = parser.parse_args(argv)
+
+    # 모든 세션의 번역 호출이 네트워크 대신 대역으로 가도록 교체
+    deep_translator.GoogleTranslator = stub_translator(args.translate_latency)
+    logging.disable(logging.WARNING)
+    # Python 3.11의 ast.parse는 여러 스레드에서 동시에 부르면 깨질 수 있음.
+    # app.py는 매직 명령을 쓰지 않으므로 끄고 compile()만 쓰게 함
+    config.set_option('runner.magicEnabled', False)
+
+    levels = []
+    for index, sessions in enumerate(args.sessions):
+        notices = level_notices(args.seed, index, sessions, args.rounds)
+
+        # 단계마다 빈 보관소와 새 공유 자원(보관소, 번역 스케줄러와 그 결과 캐시, 렌더 풀)으로 측정해
+        # 앞 단계의 번역/이미지가 재사용되지 않게 함
+        with tempfile.TemporaryDirectory() as archive_dir:
+            os.environ['PROMO_ARCHIVE_DIR'] = archive_dir
+            st.cache_resource.clear()
+            level = run_level(sessions, notices, args.timeout)
+            st.cache_resource.clear()
+
+        levels.append(level)
+        total = level.get('total', {})
+        print(
+            f"세션 {sessions:>3}: p50 {total.get('p50', 0):.2f}s  p95 {total.get('p95', 0):.2f}s  "
+            f"CPU/세션 {level['cpu_seconds_per_session']:.2f}s  최대 RSS {level['peak_rss_mb']:.0f}MB  "
+            f"워커 포함 최대 PSS {level['peak_total_pss_mb']:.0f}MB  "
+            f"오류 {len(level['errors'])}",
+            file=sys.stderr
+        )
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'rounds': args.rounds,
+            'translate_latency': args.translate_latency,
+            'seed': args.seed
+        },
+        'levels': levels
+    }
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    else:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+
+if __name__ == '__main__':
+    main()
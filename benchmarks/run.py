@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+단계별 벤치마크 실행 - 결과를 JSON 보고서로 저장하고 커밋 간 비교
+
+사용법:
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.corpus import generate_corpus, write_docx, write_pdf
+from benchmarks.stubs import stub_translator
+
+CORPUS_SIZES = {
+    'short': 5,
+    'medium': 100,
+    'long': 2000
+}
+
+# ============================================
+# 측정
+# ============================================
+
+def measure(func, repeat, warmup=1):
+    """func를 repeat번 실행한 시간 통계 (초)"""
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+
+    return {
+        'repeat': repeat,
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.mean(samples),
+        'max': max(samples)
+    }
+
+def git_commit():
+    """현재 커밋 해시 (git이 없으면 None)"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# ============================================
+# 단계별 벤치마크
+# ============================================
+
+def run_benchmarks(repeat=5, translate_latency=0.05, seed=0):
+    """모든 단계를 측정해 {단계 이름: 통계} 반환"""
+    # app을 bare 모드로 불러오므로 ScriptRunContext 경고는 숨김
+    logging.disable(logging.WARNING)
+    try:
+        import app
+    finally:
+        logging.disable(logging.NOTSET)
+    import logo_store
+    import poster
+    import translation
+
+    app.GoogleTranslator = stub_translator(translate_latency)
+
+    results = {}
+    notices = {name: generate_corpus(1, lines, seed)[0] for name, lines in CORPUS_SIZES.items()}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, text in notices.items():
+            docx_path = Path(tmp) / f'{name}.docx'
+            pdf_path = Path(tmp) / f'{name}.pdf'
+            write_docx(text, docx_path)
+            write_pdf(text, pdf_path)
+
+            results[f'read_docx[{name}]'] = measure(lambda: app.read_docx(docx_path), repeat)
+            results[f'read_pdf[{name}]'] = measure(lambda: app.read_pdf(pdf_path), repeat)
+
+    for name, text in notices.items():
+        info = app.extract_key_info(text)
+        results[f'extract_key_info[{name}]'] = measure(lambda: app.extract_key_info(text), repeat)
+        results[f'create_promo_text[{name}]'] = measure(lambda: app.create_promo_text(info), repeat)
+
+    promo = app.create_promo_text(app.extract_key_info(notices['short']))
+    summary = app.create_summary(app.extract_key_info(notices['short']))
+
+    def translate_batch():
+        # 결과 캐시에 맞지 않도록 매번 새 스케줄러로 모든 언어를 번역
+        scheduler = translation.TranslationScheduler(
+            lambda text, lang: translation.translate(text, lang, app.GoogleTranslator)
+        )
+        scheduler.translate_batch(promo, list(app.LANGUAGES), deadline=app.TRANSLATION_DEADLINE)
+
+    results['translate_batch[stub]'] = measure(translate_batch, repeat)
+
+    lines = promo.split('\n')
+    title, content = lines[0], '\n'.join(lines[1:])
+    logo_hash = logo_store.default_logo_hash()
+
+    images = {'ko': {}}
+    for size_type in poster.template_sizes():
+        results[f'create_promo_image[{size_type}]'] = measure(
+            lambda: app.create_promo_image(title, content, 'ko', size_type, logo_hash=logo_hash), repeat
+        )
+        img = app.create_promo_image(title, content, 'ko', size_type, logo_hash=logo_hash)
+        results[f'encode_png[{size_type}]'] = measure(lambda: app.encode_png(img), repeat)
+        images['ko'][size_type] = app.encode_png(img)
+
+    translations = {lang: f"[{lang}] {promo}" for lang in app.LANGUAGES}
+    all_images = {lang: images['ko'] for lang in app.LANGUAGES}
+    results['build_zip'] = measure(
+        lambda: app.build_zip(notices['long'], summary, promo, translations, all_images), repeat
+    )
+
+    return results
+
+# ============================================
+# 보고서
+# ============================================
+
+def make_report(results, args):
+    """비교 가능한 JSON 보고서 생성"""
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'translate_latency': args.translate_latency,
+            'seed': args.seed
+        },
+        'results': results
+    }
+
+def compare(old, new):
+    """두 보고서의 중앙값 비교표 출력"""
+    print(f"{'단계':<32} {'이전(ms)':>10} {'현재(ms)':>10} {'비율':>7}")
+    for stage, stats in new['results'].items():
+        current = stats['median'] * 1000
+        if stage in old['results']:
+            before = old['results'][stage]['median'] * 1000
+            ratio = current / before if before else float('inf')
+            print(f"{stage:<32} {before:>10.2f} {current:>10.2f} {ratio:>6.2f}x")
+        else:
+            print(f"{stage:<32} {'-':>10} {current:>10.2f} {'new':>7}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="코끼리공장 홍보물 생성기 벤치마크")
+    parser.add_argument('--output', help="JSON 보고서 저장 경로 (없으면 표준 출력)")
+    parser.add_argument('--compare', help="비교할 이전 JSON 보고서")
+    parser.add_argument('--repeat', type=int, default=5, help="단계별 반복 횟수")
+    parser.add_argument('--translate-latency', type=float, default=0.05, help="번역기 대역의 호출당 지연(초)")
+    parser.add_argument('--seed', type=int, default=0, help="공문 생성 seed")
+    args = parser.parse_args(argv)
+
+    # 이전 실행의 번역/이미지가 재사용되지 않도록 빈 보관소에서 측정
+    with tempfile.TemporaryDirectory() as archive_dir:
+        os.environ['PROMO_ARCHIVE_DIR'] = archive_dir
+        report = make_report(run_benchmarks(args.repeat, args.translate_latency, args.seed), args)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    else:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+
+    if args.compare:
+        old = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        compare(old, report)
+
+if __name__ == '__main__':
+    main()
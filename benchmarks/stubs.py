@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크/부하 테스트용 번역기 대역 - 네트워크 없이 지연만 흉내냄
+"""
+
+import time
+
+class StubTranslator:
+    """GoogleTranslator와 같은 형태의 로컬 번역기"""
+
+    latency = 0.05
+
+    def __init__(self, source='ko', target='en'):
+        self.source = source
+        self.target = target
+
+    def translate(self, text):
+        time.sleep(self.latency)
+        return f"[{self.target}] {text}"
+
+def stub_translator(latency):
+    """지연 시간이 정해진 번역기 클래스 생성"""
+    return type('StubTranslator', (StubTranslator,), {'latency': latency})
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+렌더 워커 풀 비교 - forkserver(미리 읽은 부모에서 fork)와 spawn(워커마다 새로 읽음)의
+풀 시작 시간(워커를 모두 띄울 때까지), 첫 작업 지연, 워커별 메모리(RSS/PSS/private/shared) 측정
+
+사용법:
+    python -m benchmarks.workers --workers 4 --output workers.json
+
+PSS는 공유 페이지를 나눠 가진 몫까지 더한 값이라 워커 N개의 실제 메모리는 PSS 합으로 봄.
+/proc/self/smaps_rollup이 없는 환경에서는 pid만 나옴.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import render_pool
+from benchmarks.run import git_commit, measure
+
+def run_method(method, workers, repeat):
+    """풀 하나를 만들어 시작 시간, 첫 작업 지연, 이후 작업 시간, 워커별 메모리 측정"""
+    start = time.perf_counter()
+    pool = render_pool.RenderPool(workers, method=method)
+    startup = time.perf_counter() - start
+    job = ('이주민 한국어 교육 프로그램 안내', '일시: 2025년 1월 15일 14:00\n장소: 코끼리공장 교육실',
+           'ko', 'social', 'default', None)
+    try:
+        start = time.perf_counter()
+        pool.render(*job)
+        first_job = time.perf_counter() - start
+
+        render = measure(lambda: pool.render(*job), repeat)
+        workers_memory = pool.memory_stats()
+    finally:
+        pool.shutdown()
+
+    result = {
+        'method': method,
+        'workers': workers,
+        'startup_seconds': startup,
+        'first_job_seconds': first_job,
+        'render': render,
+        'per_worker': workers_memory
+    }
+    for field in ('rss', 'pss', 'private', 'shared'):
+        values = [w[field] for w in workers_memory if field in w]
+        if values:
+            result[f'{field}_kb'] = {'mean': statistics.mean(values), 'total': sum(values)}
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="코끼리공장 홍보물 생성기 렌더 워커 풀 비교")
+    parser.add_argument('--workers', type=int, default=4, help="워커 수")
+    parser.add_argument('--repeat', type=int, default=10, help="이미지 생성 반복 횟수")
+    parser.add_argument('--methods', nargs='+', default=['forkserver', 'spawn'], help="비교할 시작 방식")
+    parser.add_argument('--output', help="JSON 보고서 저장 경로 (없으면 표준 출력)")
+    args = parser.parse_args(argv)
+
+    methods = []
+    for method in args.methods:
+        result = run_method(method, args.workers, args.repeat)
+        methods.append(result)
+        pss = result.get('pss_kb', {}).get('total', 0) / 1024
+        private = result.get('private_kb', {}).get('mean', 0) / 1024
+        print(
+            f"{method:<10}: 시작 {result['startup_seconds']:.2f}s  첫 작업 {result['first_job_seconds']:.2f}s  "
+            f"생성 중앙값 {result['render']['median'] * 1000:.1f}ms  "
+            f"PSS 합 {pss:.0f}MB  워커당 private {private:.1f}MB",
+            file=sys.stderr
+        )
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat
+        },
+        'methods': methods
+    }
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    else:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""
+pytest 설정 - 이 파일이 있는 저장소 최상위가 sys.path에 들어가므로
+`pytest tests`로 실행해도 translation 등 앱 모듈을 불러올 수 있음
+"""
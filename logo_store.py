@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+로고 저장소 - 업로드된 로고를 해시로 한 번만 저장하고 정규화/크기별 변형을 미리 만들어 둠
+"""
+
+from PIL import Image
+from functools import lru_cache
+from pathlib import Path
+import hashlib
+import io
+import os
+import tempfile
+
+STORE_DIR = Path(__file__).parent / 'logos' / 'store'
+DEFAULT_LOGO = Path(__file__).parent / 'logos' / 'logo.png'
+
+# ============================================
+# 저장
+# ============================================
+
+def _atomic_save(img, path):
+    """임시 파일에 저장한 뒤 교체 (여러 세션이 동시에 써도 깨지지 않도록)"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            img.save(f, format='PNG')
+        os.replace(tmp, path)
+    except:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+def _normalize(data):
+    """RGBA로 변환하고 투명한 여백 잘라내기"""
+    img = Image.open(io.BytesIO(data))
+    img.load()
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
+
+    bbox = img.getchannel('A').getbbox()
+    if bbox and bbox != (0, 0) + img.size:
+        img = img.crop(bbox)
+    return img
+
+def ingest(data):
+    """로고 바이트를 저장하고 해시 반환 (같은 내용은 한 번만 저장)"""
+    logo_hash = hashlib.sha256(data).hexdigest()
+    path = STORE_DIR / f'{logo_hash}.png'
+
+    if not path.exists():
+        img = _normalize(data)
+        STORE_DIR.mkdir(parents=True, exist_ok=True)
+        _atomic_save(img, path)
+
+    return logo_hash
+
+@lru_cache(maxsize=None)
+def default_logo_hash():
+    """기본 로고(logos/logo.png)의 해시 (없으면 None)"""
+    if not DEFAULT_LOGO.exists():
+        return None
+    try:
+        return ingest(DEFAULT_LOGO.read_bytes())
+    except OSError:
+        return None
+
+# ============================================
+# 읽기
+# ============================================
+
+@lru_cache(maxsize=64)
+def get_logo(logo_hash, width):
+    """해시와 너비로 크기가 맞춰진 RGBA 로고 반환"""
+    path = STORE_DIR / f'{logo_hash}_{width}.png'
+    if path.exists():
+        img = Image.open(path)
+        img.load()
+        return img
+
+    base = Image.open(STORE_DIR / f'{logo_hash}.png')
+    height = max(1, int(width * base.size[1] / base.size[0]))
+    img = base.resize((width, height), Image.Resampling.LANCZOS)
+    _atomic_save(img, path)
+    return img
+
+def precompute(logo_hash, widths):
+    """출력 크기별 로고 변형을 미리 생성"""
+    for width in widths:
+        get_logo(logo_hash, width)
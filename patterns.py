@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""
+공문에서 날짜, 시간, 연락처를 찾는 정규식 (정보 추출과 번역 전 치환에서 함께 사용)
+"""
+
+DATE_PATTERNS = [
+    r'(\d{4})[년.-]\s*(\d{1,2})[월.-]\s*(\d{1,2})일?',
+    r'(\d{1,2})[월/]\s*(\d{1,2})일?',
+    r'(\d{4})[./]\s*(\d{1,2})[./]\s*(\d{1,2})'
+]
+
+TIME_PATTERNS = [
+    r'(\d{1,2}):(\d{2})',
+    r'(\d{1,2})시\s*(\d{1,2})?분?'
+]
+
+CONTACT_PATTERNS = [
+    r'0\d{1,2}-\d{3,4}-\d{4}',
+    r'\d{3}-\d{4}-\d{4}',
+    r'010-\d{4}-\d{4}'
+]
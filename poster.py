@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+홍보 이미지 템플릿 - 선언형 템플릿을 (템플릿, 크기)별 그리기 명령으로 한 번만 컴파일
+"""
+
+from PIL import Image, ImageDraw, ImageFont
+from functools import lru_cache
+from pathlib import Path
+import hashlib
+import io
+import json
+import re
+import logo_store
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+TEMPLATE_DIR = Path(__file__).parent / 'templates'
+FONT_DIR = Path(__file__).parent / 'fonts'
+DEFAULT_TEMPLATE = 'default'
+
+# ============================================
+# 템플릿 읽기
+# ============================================
+
+def list_templates():
+    """사용 가능한 템플릿 이름 목록"""
+    names = {p.stem for p in TEMPLATE_DIR.glob('*.json')}
+    if tomllib is not None:
+        names |= {p.stem for p in TEMPLATE_DIR.glob('*.toml')}
+    return sorted(names)
+
+@lru_cache(maxsize=None)
+def load_template(name=DEFAULT_TEMPLATE):
+    """템플릿 파일(JSON/TOML) 읽기"""
+    path = TEMPLATE_DIR / f'{name}.json'
+    if path.exists():
+        return json.loads(path.read_text(encoding='utf-8'))
+
+    path = TEMPLATE_DIR / f'{name}.toml'
+    if tomllib is not None and path.exists():
+        return tomllib.loads(path.read_text(encoding='utf-8'))
+
+    raise FileNotFoundError(f"템플릿을 찾을 수 없습니다: {name}")
+
+@lru_cache(maxsize=None)
+def template_version(name=DEFAULT_TEMPLATE):
+    """템플릿 내용 해시 (템플릿 파일이 바뀌면 달라짐)"""
+    content = json.dumps(load_template(name), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+
+def template_sizes(name=DEFAULT_TEMPLATE):
+    """템플릿이 지원하는 크기 {size_type: (label, width, height, default)}"""
+    sizes = {}
+    for size_type, spec in load_template(name)['sizes'].items():
+        sizes[size_type] = (
+            spec.get('label', size_type),
+            spec['width'],
+            spec['height'],
+            spec.get('default', False)
+        )
+    return sizes
+
+# ============================================
+# 컴파일
+# ============================================
+
+def _resolve(value, extent):
+    """'25%' 처럼 비율이면 extent 기준 픽셀로, 숫자면 그대로 픽셀로"""
+    if isinstance(value, str) and value.endswith('%'):
+        return int(extent * float(value[:-1]) / 100)
+    return int(value)
+
+@lru_cache(maxsize=None)
+def _load_font(files, size):
+    """폰트 파일 후보를 차례로 시도, 모두 실패하면 기본 폰트
+
+    fonts 폴더에 있는 파일을 먼저 찾음. 경로로 열면 FreeType이 파일을 mmap으로 읽으므로
+    렌더 워커들이 폰트 데이터를 따로 복사하지 않고 같은 페이지를 공유함
+    """
+    for font_file in files:
+        bundled = FONT_DIR / font_file
+        try:
+            return ImageFont.truetype(str(bundled) if bundled.is_file() else font_file, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+def _compile_region(region, width, height, colors, fonts):
+    """영역 하나를 픽셀 좌표 그리기 명령으로 변환"""
+    kind = region['type']
+
+    if kind == 'rect':
+        x0, y0, x1, y1 = region['box']
+        box = (_resolve(x0, width), _resolve(y0, height), _resolve(x1, width), _resolve(y1, height))
+        return ('rect', box, colors.get(region['fill'], region['fill']))
+
+    if kind == 'logo':
+        position = (_resolve(region['x'], width), _resolve(region['y'], height))
+        return ('logo', position, _resolve(region['width'], width))
+
+    if kind in ('text', 'lines'):
+        x = _resolve(region['x'], width)
+        y = _resolve(region['y'], height)
+        if kind == 'text':
+            positions = ((x, y),)
+        else:
+            step = _resolve(region['line_height'], height)
+            positions = tuple((x, y + i * step) for i in range(region['max_lines']))
+        strip = re.compile(region['strip']) if region.get('strip') else None
+        return (
+            kind,
+            region['slot'],
+            positions,
+            fonts[region['font']],
+            colors.get(region['fill'], region['fill']),
+            region.get('max_chars'),
+            strip
+        )
+
+    raise ValueError(f"알 수 없는 영역 종류: {kind}")
+
+@lru_cache(maxsize=None)
+def compile_template(name=DEFAULT_TEMPLATE, size_type='social'):
+    """(템플릿, 크기)를 픽셀이 확정된 그리기 명령 목록으로 컴파일 (결과는 캐시됨)"""
+    template = load_template(name)
+    if size_type not in template['sizes']:
+        raise KeyError(f"템플릿 '{name}'에 없는 크기입니다: {size_type}")
+
+    spec = template['sizes'][size_type]
+    width, height = spec['width'], spec['height']
+    colors = {**template.get('colors', {}), **spec.get('colors', {})}
+
+    fonts = {}
+    for key, font_spec in {**template.get('fonts', {}), **spec.get('fonts', {})}.items():
+        fonts[key] = _load_font(tuple(font_spec['files']), _resolve(font_spec['size'], height))
+
+    regions = spec.get('regions', template['regions'])
+    ops = tuple(_compile_region(r, width, height, colors, fonts) for r in regions)
+
+    return (width, height), colors.get('background', 'white'), ops
+
+def logo_widths(name=DEFAULT_TEMPLATE):
+    """템플릿의 모든 크기에서 쓰이는 로고 너비 목록"""
+    widths = set()
+    for size_type in load_template(name)['sizes']:
+        _, _, ops = compile_template(name, size_type)
+        widths.update(op[2] for op in ops if op[0] == 'logo')
+    return sorted(widths)
+
+# ============================================
+# 실행
+# ============================================
+
+def render(program, slots, logo_hash=None):
+    """컴파일된 그리기 명령을 실행해 이미지 생성
+
+    slots: {'title': str, 'content': str} 처럼 텍스트 슬롯 이름별 내용
+    logo_hash: 로고 저장소의 로고 해시 또는 None
+    """
+    size, background, ops = program
+
+    img = Image.new('RGB', size, background)
+    draw = ImageDraw.Draw(img)
+
+    for op in ops:
+        kind = op[0]
+
+        if kind == 'rect':
+            draw.rectangle(op[1], fill=op[2])
+
+        elif kind == 'logo':
+            if logo_hash is None:
+                continue
+            _, position, logo_width = op
+            logo = logo_store.get_logo(logo_hash, logo_width)
+            img.paste(logo, position, logo)
+
+        else:
+            _, slot, positions, font, fill, max_chars, strip = op
+            text = slots.get(slot, '')
+            lines = [text] if kind == 'text' else text.split('\n')
+
+            for position, line in zip(positions, lines):
+                if strip is not None:
+                    line = strip.sub('', line)
+                draw.text(position, line[:max_chars], fill=fill, font=font)
+
+    return img
+
+def encode_png(img):
+    """이미지를 PNG 바이트로 변환"""
+    img_byte_arr = io.BytesIO()
+    img.save(img_byte_arr, format='PNG')
+    return img_byte_arr.getvalue()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+렌더 워커 풀 - 폰트/템플릿/로고를 미리 읽어 둔 forkserver 부모에서 워커를 fork
+"""
+
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import types
+
+def _render_job(*args):
+    import render_worker
+    return render_worker.render_png(*args)
+
+def _memory_job(delay):
+    import render_worker
+    # 모든 워커가 하나씩 받도록 잠시 붙잡아 둠
+    time.sleep(delay)
+    return render_worker.memory_stats()
+
+def _preload_job():
+    import render_worker  # noqa: F401
+
+def _start_job(delay):
+    # 모든 워커가 뜰 때까지 잠시 붙잡아 둠
+    time.sleep(delay)
+
+_main_lock = threading.Lock()
+
+@contextmanager
+def _without_main():
+    """워커를 띄우는 동안 __main__을 빈 모듈로 가림
+
+    streamlit은 실행 중인 앱 스크립트를 __main__으로 등록하므로 그대로 두면
+    multiprocessing이 워커마다 앱 스크립트(화면 코드 포함)를 다시 실행함.
+    streamlit은 세션마다 스크립트를 실행할 때 __main__을 새로 등록하므로, 그 사이에
+    다른 세션이 __main__을 바꿨으면 이전 모듈로 되돌리지 않고 그대로 둠
+    """
+    with _main_lock:
+        main = sys.modules['__main__']
+        placeholder = types.ModuleType('__main__')
+        sys.modules['__main__'] = placeholder
+        try:
+            yield
+        finally:
+            if sys.modules.get('__main__') is placeholder:
+                sys.modules['__main__'] = main
+
+class RenderPool:
+    """홍보 이미지를 워커 프로세스에서 그리는 풀
+
+    method='forkserver'이면 render_worker를 불러온 부모에서 워커를 fork (미리 읽은 데이터 공유)
+    method='spawn'이면 워커마다 render_worker를 새로 불러옴 (비교용)
+    """
+
+    def __init__(self, max_workers=None, method='forkserver'):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.method = method
+        self.restarts = 0
+        self._lock = threading.Lock()
+        self._pool = self._create()
+
+    def _create(self, start_delay=0.2):
+        """풀을 만들고 워커를 모두 미리 띄움
+
+        워커는 풀이 처음 필요할 때 하나씩 뜨므로 여기서 max_workers개 작업을 한꺼번에 보내
+        __main__을 가린 상태에서 전부 띄워 둠 (이후에는 새 워커를 띄우지 않음)
+        """
+        context = multiprocessing.get_context(self.method)
+        with _without_main():
+            if self.method == 'forkserver':
+                context.set_forkserver_preload(['render_worker'])
+                pool = ProcessPoolExecutor(self.max_workers, mp_context=context)
+            else:
+                pool = ProcessPoolExecutor(self.max_workers, mp_context=context, initializer=_preload_job)
+            started = [pool.submit(_start_job, start_delay) for _ in range(self.max_workers)]
+        wait(started)
+        return pool
+
+    def _restart(self, broken):
+        """워커가 죽어 망가진 풀을 새로 만듦 (다른 스레드가 이미 바꿨으면 그대로 둠)"""
+        with self._lock:
+            if self._pool is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._pool = self._create()
+                self.restarts += 1
+
+    def _submit(self, fn, *args):
+        pool = self._pool
+        try:
+            return pool, pool.submit(fn, *args)
+        except BrokenProcessPool:
+            self._restart(pool)
+            pool = self._pool
+            return pool, pool.submit(fn, *args)
+
+    def submit(self, title, content, lang_code, size_type, template, logo_hash):
+        """PNG 바이트를 돌려줄 Future"""
+        return self._submit(_render_job, title, content, lang_code, size_type, template, logo_hash)[1]
+
+    def render(self, title, content, lang_code, size_type, template, logo_hash):
+        """PNG 바이트, 작업 중에 워커가 죽으면 풀을 새로 만들어 한 번 더 그림"""
+        args = (title, content, lang_code, size_type, template, logo_hash)
+        pool, future = self._submit(_render_job, *args)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            self._restart(pool)
+            return self._submit(_render_job, *args)[1].result()
+
+    def memory_stats(self, delay=0.5):
+        """워커별 메모리 (KB), 워커 수만큼 작업을 동시에 보내 각 워커가 하나씩 답하게 함"""
+        futures = [self._submit(_memory_job, delay)[1] for _ in range(self.max_workers)]
+        stats = {}
+        for future in futures:
+            result = future.result()
+            stats[result['pid']] = result
+        return list(stats.values())
+
+    def shutdown(self):
+        self._pool.shutdown()
+
+def create_pool(max_workers=None):
+    """forkserver를 쓸 수 있으면 워커 풀, 아니면 None (Windows 등에서는 앱 프로세스에서 그림)"""
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return None
+    return RenderPool(max_workers)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+렌더 워커 - forkserver 부모가 미리 불러오는 모듈
+
+불러올 때 모든 템플릿/크기를 컴파일(폰트 포함)하고 기본 로고 변형을 읽어 둠.
+워커는 이 부모에서 fork되므로 이 데이터를 copy-on-write로 공유함
+"""
+
+import gc
+import os
+
+import poster
+import logo_store
+
+def preload():
+    """템플릿, 폰트, 기본 로고를 미리 읽기"""
+    for name in poster.list_templates():
+        for size_type in poster.template_sizes(name):
+            poster.compile_template(name, size_type)
+
+        logo_hash = logo_store.default_logo_hash()
+        if logo_hash:
+            logo_store.precompute(logo_hash, poster.logo_widths(name))
+
+    # 미리 읽은 객체를 GC 대상에서 빼서 워커에서 참조 정보를 쓰느라 페이지가 복사되지 않게 함
+    gc.freeze()
+
+preload()
+
+def render_png(title, content, lang_code, size_type, template, logo_hash):
+    """홍보 이미지를 그려 PNG 바이트로 반환"""
+    program = poster.compile_template(template, size_type)
+    img = poster.render(program, {'title': title, 'content': content}, logo_hash)
+    return poster.encode_png(img)
+
+def memory_stats():
+    """이 프로세스의 메모리 (KB): rss, pss, private(이 워커만 쓰는 양), shared"""
+    stats = {'pid': os.getpid()}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty'):
+                    stats[key] = int(value.split()[0])
+    except OSError:
+        return stats
+
+    stats['rss'] = stats.pop('Rss')
+    stats['pss'] = stats.pop('Pss')
+    stats['shared'] = stats.pop('Shared_Clean') + stats.pop('Shared_Dirty')
+    stats['private'] = stats.pop('Private_Clean') + stats.pop('Private_Dirty')
+    return stats
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+같은 작업 합치기 - 여러 세션이 같은 키로 동시에 요청하면 한 번만 실행하고 결과를 함께 받음
+"""
+
+from concurrent.futures import Future
+import hashlib
+import threading
+
+def text_hash(text):
+    """키로 쓸 텍스트 해시"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class SingleFlight:
+    """키별로 실행 중인 작업을 하나만 두고, 같은 키의 요청은 그 결과를 기다리게 함
+
+    끝난 결과는 보관하지 않음 (실행 중인 요청만 합침)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def submit(self, key, start):
+        """start()가 돌려주는 Future를 키별로 공유 (실행 중인 게 있으면 start를 부르지 않음)"""
+        with self._lock:
+            self.calls += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = start()
+            self._inflight[key] = future
+            self.executed += 1
+
+        future.add_done_callback(lambda f: self._forget(key, f))
+        return future
+
+    def do(self, key, fn):
+        """fn()을 호출한 스레드에서 실행, 같은 키가 실행 중이면 그 결과를 기다림"""
+        with self._lock:
+            self.calls += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._forget(key, future)
+
+    def stats(self):
+        """{'calls': 요청 수, 'executed': 실제 실행 수, 'coalesced': 합쳐진 수, 'inflight': 실행 중}"""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'inflight': len(self._inflight)
+            }
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+원문 저장소 - 공문 원문을 해시로 한 번만 디스크에 저장하고 줄 위치 색인으로 필요한 줄만 읽음
+
+보관소 폴더(archive.archive_dir()) 아래 sources/에 저장함
+"""
+
+from functools import lru_cache
+from pathlib import Path
+import os
+import tempfile
+
+import numpy as np
+
+from singleflight import text_hash
+
+def store_dir():
+    """원문 폴더 (PROMO_ARCHIVE_DIR를 바꾸면 함께 바뀜)"""
+    # archive가 이 모듈을 불러오므로 여기서는 쓸 때 불러옴
+    from archive import archive_dir
+    return archive_dir() / 'sources'
+
+# ============================================
+# 저장
+# ============================================
+
+def _atomic_write(data, path):
+    """임시 파일에 쓴 뒤 교체 (여러 세션이 동시에 써도 깨지지 않도록)"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+def put(text):
+    """원문을 저장하고 해시 반환 (같은 내용은 한 번만 저장)"""
+    source_hash = text_hash(text)
+    folder = store_dir()
+    path = folder / f'{source_hash}.txt'
+
+    if not path.exists():
+        data = text.encode('utf-8')
+        # 줄 i는 data[bounds[i]:bounds[i + 1] - 1] (끝의 줄바꿈 제외)
+        newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord('\n'))
+        bounds = np.concatenate(([0], newlines + 1, [len(data) + 1])).astype(np.uint64)
+
+        folder.mkdir(parents=True, exist_ok=True)
+        _atomic_write(bounds.tobytes(), folder / f'{source_hash}.idx')
+        _atomic_write(data, path)
+
+    return source_hash
+
+# ============================================
+# 읽기
+# ============================================
+
+@lru_cache(maxsize=32)
+def _bounds(source_hash):
+    return np.fromfile(store_dir() / f'{source_hash}.idx', dtype=np.uint64)
+
+def line_count(source_hash):
+    """원문 줄 수"""
+    return len(_bounds(source_hash)) - 1
+
+def read_lines(source_hash, start, count):
+    """start번째 줄부터 count줄 (파일에서 그 부분만 읽음)"""
+    bounds = _bounds(source_hash)
+    total = len(bounds) - 1
+    start = max(0, min(start, total))
+    end = max(start, min(start + count, total))
+    if start == end:
+        return []
+
+    with open(store_dir() / f'{source_hash}.txt', 'rb') as f:
+        f.seek(int(bounds[start]))
+        data = f.read(int(bounds[end]) - 1 - int(bounds[start]))
+    return data.decode('utf-8').split('\n')
+
+def read_text(source_hash):
+    """원문 전체"""
+    return (store_dir() / f'{source_hash}.txt').read_bytes().decode('utf-8')
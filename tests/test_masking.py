@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""번역 전 자리표시자 치환/복원 테스트"""
+
+import pytest
+
+import translation
+
+class EchoTranslator:
+    """받은 텍스트를 그대로 돌려주는 번역기"""
+
+    sent = []
+
+    def __init__(self, source='ko', target='en'):
+        self.target = target
+
+    def translate(self, text):
+        EchoTranslator.sent.append(text)
+        return text
+
+@pytest.mark.parametrize('text', [
+    '수업 3시간 진행',
+    '하루 2시간씩 4주 과정',
+    '밀가루 1/2 컵',
+    '1/23/4 구역',
+])
+def test_round_trip_keeps_text_that_is_not_date_or_time(text):
+    masked, spans, layout = translation.mask(text)
+    assert translation.unmask(masked, spans, layout, 'en') == text
+    assert translation.translate(text, 'en', EchoTranslator) == text
+
+def test_hours_are_not_masked_as_time():
+    masked, spans, _ = translation.mask('수업 3시간 진행')
+    assert spans == []
+    assert masked == '수업 3시간 진행'
+
+def test_fraction_is_not_masked_as_date():
+    masked, spans, _ = translation.mask('밀가루 1/2 컵')
+    assert spans == []
+
+def test_dates_and_times_are_localized():
+    text = '일시: 2025년 1월 15일 2시 30분\n마감: 3월 2일 14:00'
+    assert translation.translate(text, 'en', EchoTranslator) == (
+        '일시: January 15, 2025 2:30\n마감: March 2 14:00'
+    )
+
+def test_digits_around_date_are_not_split():
+    masked, spans, _ = translation.mask('코드 120251215')
+    assert spans == []
+
+def test_contacts_and_edge_emoji_are_kept():
+    text = '📞 문의: 052-123-4567 📞\n\n🎉 참가비 무료'
+    EchoTranslator.sent.clear()
+    assert translation.translate(text, 'en', EchoTranslator) == text
+    assert EchoTranslator.sent == ['문의: ⟦0⟧\n참가비 무료']
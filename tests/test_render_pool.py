@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""렌더 워커 풀이 워커를 띄우는 동안 __main__을 가리고 되돌리는지 테스트"""
+
+import sys
+import types
+
+import render_pool
+
+def test_main_is_hidden_and_restored():
+    main = sys.modules['__main__']
+
+    with render_pool._without_main():
+        hidden = sys.modules['__main__']
+        assert hidden is not main
+        assert not hasattr(hidden, '__file__')
+
+    assert sys.modules['__main__'] is main
+
+def test_main_installed_meanwhile_is_kept():
+    # 워커를 띄우는 사이에 다른 세션의 스크립트 실행이 __main__을 새로 등록한 경우
+    main = sys.modules['__main__']
+    script = types.ModuleType('__main__')
+    try:
+        with render_pool._without_main():
+            sys.modules['__main__'] = script
+        assert sys.modules['__main__'] is script
+    finally:
+        sys.modules['__main__'] = main
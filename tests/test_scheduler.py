@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""번역 스케줄러와 서킷 브레이커 테스트 (번역기 대신 로컬 함수 사용)"""
+
+import threading
+import time
+
+import translation
+from translation import CircuitBreaker, TranslationScheduler
+
+LANGS = ['en', 'ja', 'zh-CN', 'vi', 'ru', 'uz', 'si']
+
+class StubBackend:
+    """지연/실패를 흉내내는 translate_fn, 호출 수를 셈"""
+
+    def __init__(self, latency=0.0, fail=False):
+        self.latency = latency
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, text, lang):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        if self.fail:
+            raise ConnectionError('backend down')
+        return f'[{lang}] {text}'
+
+class FakeClock:
+    """CircuitBreaker에 넘기는 시계, advance로만 시간이 흐름"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+def wait_until(predicate, timeout=5.0):
+    """predicate가 참이 될 때까지 기다림 (timeout초가 지나면 False)"""
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+def make_scheduler(backend, **kwargs):
+    # 테스트 중에는 백그라운드 재시도가 돌지 않게 함
+    kwargs.setdefault('retry_interval', 60)
+    return TranslationScheduler(backend, **kwargs)
+
+# ============================================
+# 서킷 브레이커
+# ============================================
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == 'closed'
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+def test_breaker_half_open_allows_one_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    clock.advance(29)
+    assert breaker.state == 'open'
+    clock.advance(1)
+
+    assert breaker.state == 'half-open'
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.allow()
+
+def test_breaker_failed_probe_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30, clock=clock)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.advance(30)
+
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+# ============================================
+# 스케줄러
+# ============================================
+
+def test_healthy_backend_translates_every_language():
+    # 호출마다 제한 시간 안에 끝나면 언어가 많아도 시간 초과로 세면 안 됨
+    # (한 줄로 세우면 7 × 0.1초로 제한 시간을 넘음)
+    backend = StubBackend(latency=0.1)
+    scheduler = make_scheduler(backend, call_timeout=0.5, hedge_after=0.4)
+
+    results, pending = scheduler.translate_batch('안내', LANGS, deadline=5)
+
+    assert pending == []
+    assert results == {lang: f'[{lang}] 안내' for lang in LANGS}
+    assert scheduler.breaker.state == 'closed'
+    assert scheduler.breaker.failures == 0
+
+def test_concurrent_sessions_do_not_trip_breaker():
+    backend = StubBackend(latency=0.1)
+    scheduler = make_scheduler(backend, call_timeout=0.5, hedge_after=0.4)
+    outcomes = []
+
+    def session(i):
+        outcomes.append(scheduler.translate_batch(f'안내 {i}', LANGS, deadline=5))
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(pending == [] and len(results) == len(LANGS) for results, pending in outcomes)
+    assert scheduler.breaker.failures == 0
+
+def test_korean_and_cached_languages_skip_backend():
+    backend = StubBackend()
+    scheduler = make_scheduler(backend)
+    scheduler.translate_batch('안내', ['en'], deadline=5)
+    calls = backend.calls
+
+    results, pending = scheduler.translate_batch('안내', ['ko', 'en'], deadline=5)
+
+    assert results == {'ko': '안내', 'en': '[en] 안내'}
+    assert backend.calls == calls
+
+def test_shared_call_failure_is_counted_once():
+    backend = StubBackend(latency=0.5, fail=True)
+    breaker = CircuitBreaker(failure_threshold=100)
+    scheduler = make_scheduler(backend, breaker=breaker, max_attempts=1, hedge_after=10)
+
+    barrier = threading.Barrier(3)
+    outcomes = []
+
+    def session():
+        barrier.wait()
+        outcomes.append(scheduler.translate_batch('안내', ['en'], deadline=2))
+
+    threads = [threading.Thread(target=session) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(pending == ['en'] for _, pending in outcomes)
+    assert scheduler.flight.stats()['coalesced'] > 0
+    assert breaker.failures == backend.calls
+
+def test_slow_call_times_out_once_and_late_result_is_kept():
+    backend = StubBackend(latency=0.5)
+    breaker = CircuitBreaker(failure_threshold=100)
+    scheduler = make_scheduler(backend, breaker=breaker, call_timeout=0.1, max_attempts=1, hedge_after=10)
+
+    results, pending = scheduler.translate_batch('안내', ['en'], deadline=1)
+
+    assert results == {}
+    assert pending == ['en']
+    assert breaker.failures == 1
+
+    assert wait_until(lambda: scheduler.cached('안내', 'en') is not None)
+    assert scheduler.cached('안내', 'en') == '[en] 안내'
+    assert breaker.failures == 1
+
+def test_queue_wait_is_not_a_timeout():
+    # 재시도 풀에 스레드가 하나뿐이라 뒤 호출은 앞 호출이 끝날 때까지 기다림
+    # (마지막 호출은 넣은 때부터 0.9초 뒤에 끝나지만 실행 시간은 0.3초)
+    backend = StubBackend(latency=0.3)
+    breaker = CircuitBreaker(failure_threshold=100)
+    scheduler = make_scheduler(backend, breaker=breaker, max_workers=1, call_timeout=0.6)
+
+    futures = [scheduler._submit(scheduler._pool, '안내', lang) for lang in ('en', 'ja', 'vi')]
+
+    assert [scheduler._wait(future) for future in futures] == ['[en] 안내', '[ja] 안내', '[vi] 안내']
+    assert breaker.failures == 0
+
+def test_open_breaker_returns_pending_without_calling():
+    backend = StubBackend()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    scheduler = make_scheduler(backend, breaker=breaker)
+
+    results, pending = scheduler.translate_batch('안내', ['en', 'ja'], deadline=1)
+
+    assert results == {}
+    assert sorted(pending) == ['en', 'ja']
+    assert backend.calls == 0
+
+def test_cancel_stops_batch_without_background_retry():
+    backend = StubBackend(latency=0.5)
+    scheduler = make_scheduler(backend)
+    cancel = threading.Event()
+    cancel.set()
+
+    results, pending = scheduler.translate_batch('안내', ['en'], deadline=5, cancel=cancel)
+
+    assert results == {}
+    assert pending == ['en']
+    assert scheduler.pending('안내') == []
+
+def test_masked_translate_runs_through_scheduler():
+    class Translator:
+        def __init__(self, source='ko', target='en'):
+            self.target = target
+
+        def translate(self, text):
+            return text
+
+    scheduler = make_scheduler(lambda text, lang: translation.translate(text, lang, Translator))
+    results, _ = scheduler.translate_batch('수업 3시간, 2025년 1월 15일', ['en'], deadline=5)
+    assert results['en'] == '수업 3시간, January 15, 2025'
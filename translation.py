@@ -0,0 +1,605 @@
+# -*- coding: utf-8 -*-
+"""
+번역 - 자리표시자 치환으로 보낼 글자 수 줄이기, 마감 시간/헤지 요청/서킷 브레이커가 있는 번역 스케줄러
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import lru_cache
+import random
+import re
+import threading
+import time
+
+import deep_translator
+
+from patterns import CONTACT_PATTERNS
+from singleflight import SingleFlight, text_hash
+
+# 번역 전 치환용 날짜/시간 (정보 추출용보다 엄격하게)
+# - 앞뒤가 숫자면 날짜가 아님 ('12025년 1월', '1/23/4' 같은 조각을 잡지 않음)
+# - 연도 없는 날짜는 '1월 15일' 형식만 ('1/2'는 분수일 수 있음)
+# - '3시간'의 '3시'는 시각이 아님
+MASK_DATE_PATTERNS = [
+    r'(?<!\d)(\d{4})[년.-]\s*(\d{1,2})[월.-]\s*(\d{1,2})일?(?!\d)',
+    r'(?<!\d)(\d{4})[./]\s*(\d{1,2})[./]\s*(\d{1,2})(?!\d)',
+    r'(?<!\d)(\d{1,2})월\s*(\d{1,2})일?(?!\d)'
+]
+
+MASK_TIME_PATTERNS = [
+    r'(?<!\d)(\d{1,2}):(\d{2})(?!\d)',
+    r'(?<!\d)(\d{1,2})시(?!간)(?:\s*(\d{1,2})분)?'
+]
+
+EMOJI_PATTERN = r'[\U0001F000-\U0001FAFF\u2600-\u27BF\u2B00-\u2BFF][\uFE0F\u200D\U0001F000-\U0001FAFF\u2600-\u27BF]*'
+
+# 앞에 있을수록 먼저 치환됨 (겹치는 부분은 먼저 잡은 쪽이 가져감)
+# 날짜는 연도가 있는 형식을 먼저 봐야 '2025년 1월 15일'이 '1월 15일'로 잘리지 않음
+MASK_PATTERNS = (
+    [('contact', re.compile(p)) for p in CONTACT_PATTERNS] +
+    [('date', re.compile(p)) for p in MASK_DATE_PATTERNS] +
+    [('time', re.compile(p)) for p in MASK_TIME_PATTERNS] +
+    [('emoji', re.compile(EMOJI_PATTERN))]
+)
+
+# 줄 앞뒤의 이모지 장식 (번역기로 보내지 않음)
+EDGE_PREFIX = re.compile(rf'(?:{EMOJI_PATTERN}|\s)*')
+EDGE_SUFFIX = re.compile(rf'(?:{EMOJI_PATTERN}|\s)*$')
+
+PLACEHOLDER = '⟦{}⟧'
+PLACEHOLDER_PATTERN = re.compile(r'⟦\s*(\d+)\s*⟧')
+
+MONTHS_EN = [
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+]
+
+# 언어별 날짜 형식 (연도 있음, 연도 없음)
+DATE_FORMATS = {
+    'en': (lambda y, m, d: f"{MONTHS_EN[m - 1]} {d}, {y}", lambda m, d: f"{MONTHS_EN[m - 1]} {d}"),
+    'ja': (lambda y, m, d: f"{y}年{m}月{d}日", lambda m, d: f"{m}月{d}日"),
+    'zh-CN': (lambda y, m, d: f"{y}年{m}月{d}日", lambda m, d: f"{m}月{d}日"),
+    'vi': (lambda y, m, d: f"{d:02d}/{m:02d}/{y}", lambda m, d: f"{d:02d}/{m:02d}"),
+    'ru': (lambda y, m, d: f"{d:02d}.{m:02d}.{y}", lambda m, d: f"{d:02d}.{m:02d}"),
+    'uz': (lambda y, m, d: f"{d:02d}.{m:02d}.{y}", lambda m, d: f"{d:02d}.{m:02d}"),
+    'si': (lambda y, m, d: f"{y}-{m:02d}-{d:02d}", lambda m, d: f"{m:02d}-{d:02d}")
+}
+
+# ============================================
+# 자리표시자 치환
+# ============================================
+
+def _mask_line(line, spans):
+    """한 줄 안의 날짜/시간/연락처/이모지를 자리표시자로 치환 (spans에 원문 추가)"""
+    found = []
+    for kind, pattern in MASK_PATTERNS:
+        for match in pattern.finditer(line):
+            # '2시 ' 처럼 뒤 공백까지 잡힌 경우 공백은 남겨 둠
+            original = match.group(0).rstrip()
+            start = match.start()
+            end = start + len(original)
+            if start == end or any(start < e and s < end for s, e, _, _ in found):
+                continue
+            found.append((start, end, kind, original))
+
+    found.sort()
+    parts = []
+    last = 0
+    for start, end, kind, original in found:
+        parts.append(line[last:start])
+        parts.append(PLACEHOLDER.format(len(spans)))
+        spans.append((kind, original))
+        last = end
+    parts.append(line[last:])
+    return ''.join(parts)
+
+def mask(text):
+    """번역 전에 보낼 필요가 없는 부분을 떼어내고 나머지를 자리표시자로 치환
+
+    - 줄 앞뒤의 이모지 장식과 빈 줄은 아예 보내지 않고 layout에 보관
+    - 줄 안의 날짜/시간/연락처/이모지는 ⟦번호⟧ 자리표시자로 바꾸고 spans에 보관
+
+    반환: (번역할 텍스트, spans, layout)
+    """
+    spans = []
+    layout = []
+    bodies = []
+
+    for line in text.split('\n'):
+        prefix = EDGE_PREFIX.match(line).group(0)
+        suffix = EDGE_SUFFIX.search(line, len(prefix)).group(0)
+        body = line[len(prefix):len(line) - len(suffix)]
+
+        if not body.strip():
+            layout.append((line, None))
+            continue
+
+        layout.append((prefix, suffix))
+        bodies.append(_mask_line(body, spans))
+
+    return '\n'.join(bodies), spans, layout
+
+def unmask(translated, spans, layout, target_lang):
+    """떼어낸 장식과 자리표시자를 복원 (날짜는 대상 언어 형식으로)
+
+    번역기가 줄 수를 바꾸거나 자리표시자를 빠뜨리면 None
+    """
+    seen = set()
+
+    def restore(match):
+        index = int(match.group(1))
+        if index >= len(spans):
+            return match.group(0)
+        seen.add(index)
+        kind, original = spans[index]
+        return localize(kind, original, target_lang)
+
+    restored = PLACEHOLDER_PATTERN.sub(restore, translated)
+    if len(seen) != len(spans) or PLACEHOLDER_PATTERN.search(restored):
+        return None
+
+    bodies = restored.split('\n') if restored else []
+    if len(bodies) != sum(1 for _, suffix in layout if suffix is not None):
+        return None
+
+    lines = []
+    bodies = iter(bodies)
+    for prefix, suffix in layout:
+        if suffix is None:
+            lines.append(prefix)
+        else:
+            lines.append(prefix + next(bodies).strip() + suffix)
+    return '\n'.join(lines)
+
+# ============================================
+# 날짜/시간 형식 변환
+# ============================================
+
+@lru_cache(maxsize=1024)
+def localize(kind, original, target_lang):
+    """치환된 값을 대상 언어에 맞게 변환 (결과는 캐시됨)"""
+    if kind == 'date':
+        return format_date(original, target_lang)
+    if kind == 'time':
+        return format_time(original)
+    return original
+
+def format_date(original, target_lang):
+    """'2025년 1월 15일' 같은 날짜를 대상 언어 형식으로"""
+    if target_lang not in DATE_FORMATS:
+        return original
+
+    with_year, without_year = DATE_FORMATS[target_lang]
+    for pattern in MASK_DATE_PATTERNS:
+        match = re.fullmatch(pattern, original)
+        if not match:
+            continue
+        numbers = [int(g) for g in match.groups()]
+        if len(numbers) == 3:
+            y, m, d = numbers
+            if 1 <= m <= 12 and 1 <= d <= 31:
+                return with_year(y, m, d)
+        else:
+            m, d = numbers
+            if 1 <= m <= 12 and 1 <= d <= 31:
+                return without_year(m, d)
+    return original
+
+def format_time(original):
+    """'2시 30분' 같은 시간을 '2:30' 으로 (이미 14:00 형식이면 그대로)"""
+    match = re.fullmatch(MASK_TIME_PATTERNS[1], original.strip())
+    if not match:
+        return original
+    hour, minute = match.groups()
+    return f"{int(hour)}:{int(minute or 0):02d}"
+
+# ============================================
+# 번역
+# ============================================
+
+def translate(text, target_lang, translator_cls=None):
+    """자리표시자 치환을 거쳐 번역 (실패하면 예외)"""
+    if target_lang == 'ko':
+        return text
+
+    if translator_cls is None:
+        translator_cls = deep_translator.GoogleTranslator
+    translator = translator_cls(source='ko', target=target_lang)
+
+    # 날짜/연락처/이모지는 빼고 보내서 글자 수를 줄이고 값이 망가지지 않게 함
+    masked, spans, layout = mask(text)
+    translated = translator.translate(masked) if masked.strip() else masked
+    restored = unmask(translated, spans, layout, target_lang)
+
+    # 번역기가 줄이나 자리표시자를 망가뜨린 경우 원문 전체로 다시 번역
+    if restored is None:
+        return translator.translate(text)
+    return restored
+
+# ============================================
+# 서킷 브레이커
+# ============================================
+
+class CircuitBreaker:
+    """연속 실패가 쌓이면 한동안 호출을 막고, 시간이 지나면 한 번만 시험 호출을 허용
+
+    clock은 현재 시각(초)을 돌려주는 함수 (테스트에서 바꿔 끼울 수 있음)
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.opened_at is None:
+                return 'closed'
+            if self.clock() - self.opened_at < self.reset_timeout:
+                return 'open'
+            return 'half-open'
+
+    def allow(self):
+        """지금 호출해도 되는지 (half-open이면 시험 호출 하나만 허용)"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.clock() - self.opened_at < self.reset_timeout or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+            self._probing = False
+
+# ============================================
+# 번역 스케줄러
+# ============================================
+
+# 풀에서 아직 시작하지 못한 호출이 있을 때 다시 확인하는 간격 (초)
+QUEUE_POLL = 0.05
+
+class _Call:
+    """번역 호출 하나
+
+    제한 시간은 풀에서 실제로 시작된 때부터 세고 (대기열에서 기다린 시간은 빼고),
+    서킷 브레이커에는 여러 세션이 함께 기다려도 호출당 한 번만 결과를 알림
+    """
+
+    def __init__(self, fn, text, lang, breaker, timeout):
+        self.fn = fn
+        self.text = text
+        self.lang = lang
+        self.breaker = breaker
+        self.timeout = timeout
+        self.started = None
+        self._reported = False
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        self.started = time.monotonic()
+        try:
+            result = self.fn(self.text, self.lang)
+        except Exception:
+            self._report(False)
+            raise
+        self._report(True)
+        return result
+
+    def _report(self, ok):
+        with self._lock:
+            if self._reported:
+                return
+            self._reported = True
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def expired(self, now):
+        """시작한 지 제한 시간이 지났으면 True (처음 지났을 때 실패로 기록)"""
+        if self.started is None or now - self.started < self.timeout:
+            return False
+        self._report(False)
+        return True
+
+class TranslationScheduler:
+    """여러 언어를 동시에 번역하면서 배치 전체 마감 시간을 지킴
+
+    - 호출마다 제한 시간이 있고, 응답이 늦으면 같은 요청을 하나 더 보내(헤지) 먼저 온 결과를 씀
+    - 실패하면 지터가 들어간 지수 백오프 후 재시도
+    - 서킷 브레이커가 열려 있거나 마감까지 못 끝낸 언어는 '대기'로 돌려주고
+      백그라운드에서 계속 재시도 (끝난 결과는 다음 배치에서 바로 사용)
+
+    배치마다 언어 수 × 2(첫 요청과 헤지)개 스레드를 따로 써서 다른 세션의 요청 뒤에서 기다리지 않음.
+    max_workers는 백그라운드 재시도에 쓰는 스레드 수
+    """
+
+    def __init__(self, translate_fn=translate, max_workers=4, call_timeout=8.0,
+                 hedge_after=2.5, max_attempts=3, backoff=0.5, breaker=None,
+                 retry_interval=5.0, retry_for=300.0, max_results=256):
+        self.translate_fn = translate_fn
+        self.call_timeout = call_timeout
+        self.hedge_after = hedge_after
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.retry_interval = retry_interval
+        self.retry_for = retry_for
+        self.max_results = max_results
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='translate-retry')
+        self.flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._results = {}
+        self._pending = {}
+        self._retry_thread = None
+
+    def _start(self, pool, text, lang):
+        """pool에 번역 호출을 넣음 (future.call로 시작 시각을 볼 수 있음)"""
+        call = _Call(self.translate_fn, text, lang, self.breaker, self.call_timeout)
+        future = pool.submit(call)
+        future.call = call
+        return future
+
+    def _submit(self, pool, text, lang):
+        """같은 (텍스트, 언어) 번역이 이미 실행 중이면 그 요청을 함께 기다림"""
+        future = self.flight.submit((text_hash(text), lang), lambda: self._start(pool, text, lang))
+        if future.call.expired(time.monotonic()):
+            # 이미 제한 시간을 넘긴 호출에는 합치지 않음
+            future = self._start(pool, text, lang)
+        return future
+
+    def _wait(self, future):
+        """호출이 시작된 뒤 제한 시간까지 결과를 기다림 (대기열에서 기다린 시간은 세지 않음)"""
+        call = future.call
+        while True:
+            if call.started is None:
+                timeout = QUEUE_POLL
+            else:
+                timeout = max(0.0, call.started + self.call_timeout - time.monotonic())
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeoutError:
+                if call.expired(time.monotonic()):
+                    raise
+
+    def _jittered_backoff(self, failures):
+        return self.backoff * (2 ** (failures - 1)) * random.uniform(0.5, 1.5)
+
+    def _remember(self, text, lang, translated):
+        with self._lock:
+            self._results[(text, lang)] = translated
+            self._pending.pop((text, lang), None)
+            while len(self._results) > self.max_results:
+                self._results.pop(next(iter(self._results)))
+
+    def _remember_when_done(self, future, text, lang):
+        """포기한 시도라도 나중에 성공하면 결과를 보관"""
+        def done(f):
+            if not f.cancelled() and f.exception() is None:
+                self._remember(text, lang, f.result())
+        future.add_done_callback(done)
+
+    def cached(self, text, lang):
+        """이미 끝난 번역 결과 (없으면 None)"""
+        with self._lock:
+            return self._results.get((text, lang))
+
+    def translate_batch(self, text, langs, deadline=20.0, on_result=None, cancel=None):
+        """langs를 deadline초 안에 번역
+
+        반환: ({언어: 번역문}, [대기 중인 언어])
+        on_result(lang, translated)는 호출한 스레드에서 언어가 끝날 때마다 불림
+        cancel(threading.Event)이 설정되면 새 요청을 멈추고 바로 반환 (백그라운드 재시도도 안 함)
+        """
+        end = time.monotonic() + deadline
+        results = {}
+        states = {}
+
+        def finish(lang, translated):
+            results[lang] = translated
+            if on_result:
+                on_result(lang, translated)
+
+        for lang in langs:
+            cached = text if lang == 'ko' else self.cached(text, lang)
+            if cached is not None:
+                finish(lang, cached)
+            else:
+                states[lang] = {'inflight': [], 'tries': 0, 'failures': 0, 'next_start': 0.0}
+
+        # 언어마다 첫 요청과 헤지가 바로 시작될 수 있는 크기
+        pool = ThreadPoolExecutor(max_workers=max(1, len(states) * 2), thread_name_prefix='translate')
+        pending = []
+        try:
+            while states:
+                now = time.monotonic()
+                if now >= end or (cancel is not None and cancel.is_set()):
+                    break
+
+                for lang in list(states):
+                    state = states[lang]
+
+                    # 끝난 시도 확인
+                    for future in list(state['inflight']):
+                        if future.done():
+                            state['inflight'].remove(future)
+                            if future.exception() is None:
+                                self._remember(text, lang, future.result())
+                                finish(lang, future.result())
+                                break
+                            state['failures'] += 1
+                            state['next_start'] = now + self._jittered_backoff(state['failures'])
+                        elif future.call.expired(now):
+                            # 늦은 응답도 버리지 않고 도착하면 보관
+                            state['inflight'].remove(future)
+                            self._remember_when_done(future, text, lang)
+                            state['failures'] += 1
+                            state['next_start'] = now
+                    if lang in results:
+                        del states[lang]
+                        continue
+
+                    # 새 시도 (첫 요청, 재시도, 헤지)
+                    if state['inflight']:
+                        # 헤지는 앞 요청이 실제로 hedge_after초 넘게 걸리고 있을 때만
+                        ready = all(
+                            f.call.started is not None and now - f.call.started >= self.hedge_after
+                            for f in state['inflight']
+                        )
+                    else:
+                        ready = now >= state['next_start']
+
+                    if ready and state['tries'] < self.max_attempts:
+                        if self.breaker.allow():
+                            if state['inflight']:
+                                # 헤지는 일부러 같은 요청을 하나 더 보내는 것이므로 합치지 않음
+                                future = self._start(pool, text, lang)
+                            else:
+                                future = self._submit(pool, text, lang)
+                            state['inflight'].append(future)
+                            state['tries'] += 1
+                        elif not state['inflight']:
+                            # 백엔드가 불안정하면 기다리지 않고 바로 대기 처리
+                            pending.append(lang)
+                            del states[lang]
+                            continue
+
+                    if not state['inflight'] and state['tries'] >= self.max_attempts:
+                        pending.append(lang)
+                        del states[lang]
+
+                if not states:
+                    break
+
+                inflight = []
+                wake = [end]
+                queued = False
+                for state in states.values():
+                    if not state['inflight']:
+                        wake.append(state['next_start'])
+                    for future in state['inflight']:
+                        inflight.append(future)
+                        started = future.call.started
+                        if started is None:
+                            queued = True
+                            continue
+                        wake.append(started + self.call_timeout)
+                        if state['tries'] < self.max_attempts and started + self.hedge_after > now:
+                            wake.append(started + self.hedge_after)
+
+                timeout = max(0.0, min(wake) - time.monotonic())
+                if queued:
+                    timeout = min(timeout, QUEUE_POLL)
+                if cancel is not None:
+                    timeout = min(timeout, 0.5)
+                if inflight:
+                    wait(inflight, timeout=timeout, return_when=FIRST_COMPLETED)
+                else:
+                    time.sleep(timeout)
+        finally:
+            # 이미 보낸 요청은 끝까지 실행되고 결과는 보관됨
+            pool.shutdown(wait=False)
+
+        for lang, state in states.items():
+            pending.append(lang)
+            for future in state['inflight']:
+                self._remember_when_done(future, text, lang)
+        if cancel is None or not cancel.is_set():
+            for lang in pending:
+                self._schedule_retry(text, lang)
+        return results, pending
+
+    def prefetch(self, text, langs, deadline=20.0):
+        """스크립트 스레드를 막지 않고 미리 번역 시작 (결과는 캐시에 들어가 다음 배치에서 바로 쓰임)"""
+        return Prefetch(self, text, langs, deadline)
+
+    # 백그라운드 재시도
+
+    def pending(self, text):
+        """text에 대해 아직 백그라운드에서 재시도 중인 언어"""
+        with self._lock:
+            return sorted(lang for t, lang in self._pending if t == text)
+
+    def _schedule_retry(self, text, lang):
+        with self._lock:
+            self._pending.setdefault((text, lang), time.monotonic())
+            if self._retry_thread is None or not self._retry_thread.is_alive():
+                self._retry_thread = threading.Thread(
+                    target=self._retry_loop, name='translate-retry', daemon=True
+                )
+                self._retry_thread.start()
+
+    def _retry_loop(self):
+        while True:
+            time.sleep(self.retry_interval)
+            with self._lock:
+                # 너무 오래 실패한 항목은 포기
+                now = time.monotonic()
+                for key, since in list(self._pending.items()):
+                    if now - since > self.retry_for:
+                        del self._pending[key]
+                jobs = list(self._pending)
+                if not jobs:
+                    self._retry_thread = None
+                    return
+
+            for text, lang in jobs:
+                if self.cached(text, lang) is not None or not self.breaker.allow():
+                    continue
+                try:
+                    future = self._submit(self._pool, text, lang)
+                except RuntimeError:  # 인터프리터 종료 중
+                    return
+                try:
+                    translated = self._wait(future)
+                except Exception:
+                    self._remember_when_done(future, text, lang)
+                    continue
+                self._remember(text, lang, translated)
+
+class Prefetch:
+    """백그라운드 스레드에서 돌아가는 미리 번역 작업"""
+
+    def __init__(self, scheduler, text, langs, deadline):
+        self.text = text
+        self.langs = list(langs)
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(scheduler, deadline), name='translate-prefetch', daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, scheduler, deadline):
+        try:
+            scheduler.translate_batch(self.text, self.langs, deadline=deadline, cancel=self._cancel)
+        finally:
+            self._done.set()
+
+    def cancel(self):
+        """새 요청을 멈춤 (이미 보낸 요청의 결과는 캐시에 들어감)"""
+        self._cancel.set()
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """끝날 때까지 최대 timeout초 기다림, 끝났으면 True"""
+        return self._done.wait(timeout)